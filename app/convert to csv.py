@@ -1,5 +1,7 @@
 import pandas as pd
 import mysql.connector
+from role_artifacts import build_artifacts, ARTIFACT_DIR
+from job_index import build_index, INDEX_DIR
 
 conn = mysql.connector.connect(
     host='localhost',
@@ -9,5 +11,18 @@ conn = mysql.connector.connect(
 )
 
 df = pd.read_sql("SELECT * FROM jobs", conn)
+df.drop(columns=['minhash'], inplace=True, errors='ignore')
 df.to_csv("clean_jobs.csv", index=False)
 print("Exported to clean_jobs.csv")
+
+# Small weekly aggregates maintained at ingest (data/analytics.py) for the trends dashboard
+for table in ["role_weekly_counts", "role_keyword_weekly"]:
+    pd.read_sql(f"SELECT * FROM {table}", conn).to_csv(f"{table}.csv", index=False)
+    print(f"Exported to {table}.csv")
+
+# Precompute per-role keywords, chart data and word clouds for the app
+built = build_artifacts(df)
+print(f"Built artifacts for {built} in {ARTIFACT_DIR}/")
+
+# Sparse TF-IDF index the app memory-maps for CV matching
+print(f"Indexed {build_index(df)} postings in {INDEX_DIR}/")
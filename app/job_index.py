@@ -0,0 +1,112 @@
+import os
+import json
+
+from role_artifacts import ARTIFACT_DIR, simplify_title
+
+# numpy, scipy and scikit-learn are imported inside the functions that need them.
+
+INDEX_DIR = os.path.join(ARTIFACT_DIR, "job_index")
+N_FEATURES = 2 ** 18
+
+
+def _vectorizer():
+    # Stateless hashing: the app can vectorize a query without a fitted vocabulary
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(n_features=N_FEATURES, alternate_sign=False, norm=None,
+                             stop_words='english', ngram_range=(1, 2))
+
+
+def _weigh(counts, idf):
+    import numpy as np
+    from sklearn.preprocessing import normalize
+
+    counts.data = 1 + np.log(counts.data)  # sublinear tf
+    return normalize(counts.multiply(idf).tocsr())
+
+
+# --- BUILD (export time) ---
+def build_index(df, index_dir=INDEX_DIR):
+    """Persist a TF-IDF weighted, L2-normalized sparse matrix over all canonical postings.
+
+    Writes the CSR arrays and IDF weights as .npy files so the app can memory-map
+    them, plus postings.jsonl with a byte-offset table for reading only the
+    matched postings back. Returns the number of indexed postings.
+    """
+    import numpy as np
+
+    df = df.dropna(subset=['description'])
+    if 'dup_of' in df.columns:
+        df = df[df['dup_of'].isna()]
+    df = df.drop_duplicates(subset=['title', 'description'])
+    if df.empty:
+        return 0
+
+    counts = _vectorizer().transform(df['description'].str.strip()).astype(np.float32)
+    doc_freq = np.bincount(counts.indices, minlength=N_FEATURES)
+    idf = (np.log((1 + len(df)) / (1 + doc_freq)) + 1).astype(np.float32)
+    matrix = _weigh(counts, idf)
+
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, "data.npy"), matrix.data.astype(np.float32))
+    # Keep scipy's own index dtypes so loading doesn't copy the memory-mapped arrays
+    np.save(os.path.join(index_dir, "indices.npy"), matrix.indices)
+    np.save(os.path.join(index_dir, "indptr.npy"), matrix.indptr)
+    np.save(os.path.join(index_dir, "idf.npy"), idf)
+    np.save(os.path.join(index_dir, "roles.npy"), np.array([simplify_title(t) for t in df['title']], dtype="U64"))
+
+    offsets = []
+    with open(os.path.join(index_dir, "postings.jsonl"), "wb") as file:
+        for row in df.itertuples(index=False):
+            offsets.append(file.tell())
+            posting = {"title": row.title, "company": getattr(row, "company", None),
+                       "link": getattr(row, "link", None), "description": row.description.strip()}
+            file.write((json.dumps(posting, default=str) + "\n").encode())
+    np.save(os.path.join(index_dir, "offsets.npy"), np.array(offsets, dtype=np.int64))
+    return len(df)
+
+
+# --- QUERY (app) ---
+class JobIndex:
+    """Memory-mapped posting vectors answering top-k cosine similarity queries."""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        load = lambda name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r")
+        indptr = load("indptr")
+        self.matrix = csr_matrix((load("data"), load("indices"), indptr), shape=(len(indptr) - 1, N_FEATURES))
+        self.idf = np.asarray(load("idf"))
+        self.roles = load("roles")
+        self.offsets = load("offsets")
+        self.postings_path = os.path.join(index_dir, "postings.jsonl")
+        self.vectorizer = _vectorizer()
+
+    @staticmethod
+    def exists(index_dir=INDEX_DIR):
+        return os.path.exists(os.path.join(index_dir, "postings.jsonl"))
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def search(self, text, k=20, role=None):
+        """Top-k postings most similar to the text, optionally within one role: [(score, posting)]."""
+        import numpy as np
+
+        query = _weigh(self.vectorizer.transform([text]).astype(np.float32), self.idf)
+        scores = (self.matrix @ query.T).toarray().ravel()
+        if role:
+            scores[self.roles != role] = -1
+
+        k = min(k, int((scores > 0).sum()))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.posting(i)) for i in top]
+
+    def posting(self, row):
+        with open(self.postings_path, "rb") as file:
+            file.seek(int(self.offsets[row]))
+            return json.loads(file.readline())
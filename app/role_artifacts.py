@@ -0,0 +1,122 @@
+import os
+import re
+import json
+from collections import Counter
+from datetime import datetime
+
+# Heavy libraries (pandas, scikit-learn, numpy, wordcloud) are imported inside the
+# functions that need them so the Streamlit script stays cheap to (re)run.
+
+ROLES = ["Data Engineer", "Data Analyst", "Data Scientist", "Machine Learning Engineer"]
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "artifacts")
+
+
+# --- ROLE CLEANING ---
+def simplify_title(title):
+    title_lower = str(title).lower()
+    if 'data scientist' in title_lower:
+        return 'Data Scientist'
+    elif 'data engineer' in title_lower:
+        return 'Data Engineer'
+    elif 'data analyst' in title_lower or 'data analytics' in title_lower:
+        return 'Data Analyst'
+    elif 'machine learning' in title_lower or 'ml engineer' in title_lower:
+        return 'Machine Learning Engineer'
+    else:
+        return title  # leave unchanged
+
+
+def clean_role_jobs(df, role):
+    """Rows for one role with a usable description, one per near-duplicate cluster."""
+    df = df.drop(columns=['work_type', 'employment_type', 'minhash'], errors='ignore')
+    df['title'] = df['title'].apply(simplify_title)
+    df = df[df['title'].str.contains(role, case=False, na=False)]
+    df = df.dropna(subset=['description'])
+    df['description'] = df['description'].str.strip()
+    if 'dup_of' in df.columns:
+        df = df[df['dup_of'].isna()]
+    return df.drop_duplicates(subset=['title', 'description'])
+
+
+# --- KEYWORDS ---
+def compute_keywords(texts, n=10):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    import numpy as np
+
+    combined_text = " ".join(texts)
+    words = [word.lower() for word in combined_text.split() if word.isalpha() and len(word) > 2]
+    word_freq = Counter(words)
+
+    vectorizer = TfidfVectorizer(max_features=50, stop_words='english')
+    tfidf_matrix = vectorizer.fit_transform(texts)
+    feature_names = vectorizer.get_feature_names_out()
+    tfidf_scores = np.sum(tfidf_matrix, axis=0).A1
+
+    keywords = {word: score * 5 + word_freq.get(word, 0) for word, score in zip(feature_names, tfidf_scores)}
+    sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)
+    return [word[0] for word in sorted_keywords[:n]]
+
+
+# --- ARTIFACTS ---
+def role_slug(role):
+    return re.sub(r"[^a-z0-9]+", "_", role.lower()).strip("_")
+
+
+def role_dir(role, artifact_dir=None):
+    return os.path.join(artifact_dir or ARTIFACT_DIR, role_slug(role))
+
+
+def render_wordcloud(text, path):
+    from wordcloud import WordCloud
+
+    WordCloud(width=800, height=400, background_color='white', stopwords='english').generate(text).to_file(path)
+
+
+def build_artifacts(df, artifact_dir=None, roles=ROLES):
+    """Precompute keywords, chart data and a word cloud PNG for every role.
+
+    Run by the CSV export so the app can load them from disk instead of
+    importing scikit-learn/wordcloud and reprocessing the corpus at runtime.
+    """
+    built = {}
+    for role in roles:
+        jobs = clean_role_jobs(df.copy(), role)
+        texts = jobs["description"].tolist()
+        if not texts:
+            continue
+
+        out_dir = role_dir(role, artifact_dir)
+        os.makedirs(out_dir, exist_ok=True)
+
+        keywords = compute_keywords(texts)
+        summary = {
+            "role": role,
+            "job_count": len(texts),
+            "built_at": datetime.now().isoformat(timespec="seconds"),
+            "keywords": keywords,
+            "chart": {"x": keywords[::-1], "y": list(range(1, len(keywords) + 1))[::-1]}
+        }
+        with open(os.path.join(out_dir, "keywords.json"), "w") as file:
+            json.dump(summary, file, indent=2)
+
+        try:
+            render_wordcloud(" ".join(texts), os.path.join(out_dir, "wordcloud.png"))
+        except ImportError:
+            pass  # word cloud is optional; the app falls back to the keyword chart
+
+        built[role] = len(texts)
+    return built
+
+
+def load_role_summary(role, artifact_dir=None):
+    """Precomputed keywords/chart data for a role, or None if the export hasn't built them."""
+    path = os.path.join(role_dir(role, artifact_dir), "keywords.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def wordcloud_path(role, artifact_dir=None):
+    path = os.path.join(role_dir(role, artifact_dir), "wordcloud.png")
+    return path if os.path.exists(path) else None
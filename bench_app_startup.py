@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# Runs in a fresh interpreter so every measurement pays the real cold-start import cost
+PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_ready = time.perf_counter()
+
+app = AppTest.from_file(sys.argv[1], default_timeout=60)
+app.run()
+first_render = time.perf_counter()
+app.run()
+rerun = time.perf_counter()
+
+heavy = [m for m in ("pandas", "sklearn", "numpy", "plotly", "matplotlib", "wordcloud") if m in sys.modules]
+print(json.dumps({
+    "streamlit_import": streamlit_ready - start,
+    "first_render": first_render - streamlit_ready,
+    "rerun": rerun - first_render,
+    "heavy_modules_loaded": heavy,
+    "exceptions": [str(e.value) for e in app.exception]
+}))
+"""
+
+
+def measure(app_path, runs):
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE, os.path.abspath(app_path)],
+                             capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(app_path)))
+        if out.returncode != 0:
+            raise SystemExit(out.stderr)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Streamlit cold start and first render against a time budget.")
+    parser.add_argument("app", nargs="?", default="data_app.py")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=float(os.getenv("APP_RENDER_BUDGET", "1.5")),
+                        help="Max seconds for the first render (excluding Streamlit's own import)")
+    args = parser.parse_args()
+
+    results = measure(args.app, args.runs)
+    best = min(results, key=lambda r: r["first_render"])
+    print(f"{'run':<5}{'streamlit import':>18}{'first render':>14}{'rerun':>9}  heavy modules at startup")
+    for i, r in enumerate(results, 1):
+        print(f"{i:<5}{r['streamlit_import']:>18.3f}{r['first_render']:>14.3f}{r['rerun']:>9.3f}  "
+              f"{', '.join(r['heavy_modules_loaded']) or '-'}")
+    for error in best["exceptions"]:
+        print(f"App raised: {error}")
+
+    if best["first_render"] > args.budget:
+        raise SystemExit(f"First render {best['first_render']:.3f}s is over the {args.budget:.3f}s budget")
+    print(f"First render {best['first_render']:.3f}s is within the {args.budget:.3f}s budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+import os
+import re
+import json
+import sqlite3
+import asyncio
+import argparse
+import resource
+import subprocess
+import tempfile
+import time as tm
+
+import data_path  # noqa: F401  (puts data/ on sys.path)
+import metrics
+from stub_server import StubLinkedIn
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        title TEXT, company TEXT, location TEXT, link TEXT UNIQUE, source TEXT,
+        date_posted TEXT, work_type TEXT, employment_type TEXT, description TEXT,
+        minhash BLOB, dup_of TEXT
+    );
+    CREATE TABLE IF NOT EXISTS job_lsh (band TEXT, link TEXT, PRIMARY KEY (band, link));
+    CREATE TABLE IF NOT EXISTS analytics_seen (link TEXT PRIMARY KEY);
+    CREATE TABLE IF NOT EXISTS role_weekly_counts (
+        week TEXT, role TEXT, source TEXT, work_type TEXT, jobs INTEGER,
+        PRIMARY KEY (week, role, source, work_type)
+    );
+    CREATE TABLE IF NOT EXISTS role_keyword_weekly (
+        week TEXT, role TEXT, keyword TEXT, jobs INTEGER, PRIMARY KEY (week, role, keyword)
+    );
+"""
+
+
+# --- THROWAWAY DATABASE ---
+class SQLiteCursor:
+    """Translate the MySQL statements used by the writers into SQLite."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query, values=()):
+        query = query.replace("%s", "?")
+        query = re.sub(r"ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET", query)
+        query = re.sub(r"VALUES\((\w+)\)", r"excluded.\1", query)
+        query = query.replace("INSERT IGNORE", "INSERT OR IGNORE")
+        return self.cursor.execute(query, values)
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, timeout=30)
+
+    def cursor(self):
+        return SQLiteCursor(self.conn.cursor())
+
+    def commit(self):
+        self.conn.commit()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self.conn.close()
+
+
+def sqlite_factory(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.close()
+    return lambda: SQLiteConnection(path)
+
+
+def count_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+# --- TARGETS ---
+def bench_config(stub, args):
+    return {
+        "keywords": ["data analyst", "data scientist", "data engineer"][:args.keywords],
+        "locations": ["", "Remote", "Onsite", "Hybrid"],
+        "date_range": "604800",
+        "days_to_scrape": 7,
+        "base_url": stub.base_url,
+        "search_delay": [0, 0],
+        "sources": {name: {"rate_limit_seconds": 0, "jitter_seconds": 0}
+                    for name in ("linkedin", "jobspy:linkedin", "jobspy:indeed")}
+    }
+
+
+def run_cards(stub, config, connect):
+    import web
+
+    return len(web.get_job_cards(config))
+
+
+def run_scraper(stub, config, connect):
+    import storage
+    import web
+
+    if connect:
+        storage.get_db_connection = connect
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+        json.dump(config, file)
+    try:
+        asyncio.run(web.run_scraper(file.name))
+    finally:
+        os.unlink(file.name)
+    return saved_jobs()
+
+
+def run_ingest(stub, config, connect):
+    """Drive scrape_and_store with jobspy replaced by a client of the stub."""
+    import pandas as pd
+    import requests
+    import scrape_jobs_runner
+    import sources
+    import storage
+    from parsers import parse_job_cards
+
+    session = requests.Session()
+
+    def fake_scrape_jobs(site_name, search_term, location, results_wanted, **kwargs):
+        response = session.get(f"{stub.base_url}/jobs/search/", params={"keywords": search_term, "location": location}, timeout=15)
+        response.raise_for_status()
+        rows = []
+        for card in parse_job_cards(response.text)[:results_wanted]:
+            detail = session.get(card["job_url"], timeout=15)
+            rows.append({
+                "title": card["title"],
+                "company": card["company"],
+                "location": card["location"],
+                "job_url": card["job_url"],
+                "date_posted": card["date"],
+                "work_type": card["work_type"],
+                "employment_type": "N/A",
+                "description": detail.text if detail.ok else None
+            })
+        return pd.DataFrame(rows)
+
+    sources.scrape_jobs = fake_scrape_jobs
+    if connect:
+        storage.get_db_connection = connect
+    scrape_and_store_config = dict(config, desc_words=[])
+    scrape_jobs_runner.scrape_and_store(scrape_and_store_config)
+    return saved_jobs()
+
+
+def saved_jobs():
+    """Jobs that reached the DB; JOBS also counts the captcha, failed and db_error outcomes."""
+    return sum(value for _, key, value in metrics.JOBS.samples() if dict(key).get("outcome") == "saved")
+
+
+TARGETS = {"cards": run_cards, "scraper": run_scraper, "ingest": run_ingest}
+
+
+# --- REPORT ---
+def git_version():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def summarize(target, processed, elapsed, rows, stub):
+    db_write = metrics.DB_WRITE.snapshot()
+    writes = sum(series["count"] for series in db_write.values())
+    write_time = sum(series["sum"] for series in db_write.values())
+
+    return {
+        "version": git_version(),
+        "target": target,
+        "processed": processed,
+        "attempted": metrics.JOBS.total(),
+        "rows": rows,
+        "elapsed_seconds": elapsed,
+        "jobs_per_sec": processed / elapsed if elapsed else 0.0,
+        "job_p50_seconds": metrics.JOB_LATENCY.quantile(0.50),
+        "job_p99_seconds": metrics.JOB_LATENCY.quantile(0.99),
+        "db_writes_per_sec": writes / elapsed if elapsed else 0.0,
+        "db_write_mean_seconds": write_time / writes if writes else 0.0,
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "stub_requests": dict(stub.requests),
+        "metrics": metrics.build_report()
+    }
+
+
+def print_comparison(paths):
+    reports = []
+    for path in paths:
+        with open(path) as file:
+            reports.append(json.load(file))
+
+    fields = ["target", "processed", "attempted", "jobs_per_sec", "job_p50_seconds", "job_p99_seconds",
+              "db_writes_per_sec", "db_write_mean_seconds", "peak_rss_mib"]
+    print(f"{'':<24}" + "".join(f"{r['version'][:18]:>20}" for r in reports))
+    for field in fields:
+        cells = []
+        for report in reports:
+            value = report.get(field)
+            cells.append(f"{value:>20.3f}" if isinstance(value, float) else f"{str(value):>20}")
+        print(f"{field:<24}" + "".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers offline against recorded LinkedIn pages.")
+    parser.add_argument("--target", choices=TARGETS, default="cards")
+    parser.add_argument("--keywords", type=int, default=3, help="How many of the default keywords to search")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub base delay per request (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Stub extra random delay (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--captcha-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", choices=["sqlite", "mysql"], default="sqlite",
+                        help="sqlite uses a throwaway file; mysql uses the DB_* environment settings")
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--compare", nargs="+", metavar="REPORT", help="Print saved reports side by side and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        print_comparison(args.compare)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.sqlite")
+        connect = sqlite_factory(db_path) if args.db == "sqlite" else None
+
+        with StubLinkedIn(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          captcha_rate=args.captcha_rate, seed=args.seed) as stub:
+            config = bench_config(stub, args)
+            metrics.reset()
+            start_time = tm.perf_counter()
+            processed = TARGETS[args.target](stub, config, connect)
+            elapsed = tm.perf_counter() - start_time
+
+        rows = count_rows(db_path) if args.db == "sqlite" else None
+        report = summarize(args.target, processed, elapsed, rows, stub)
+
+    print(json.dumps({k: v for k, v in report.items() if k != "metrics"}, indent=2))
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import re
+from datetime import date, datetime, timedelta
+
+# Skill vocabulary tracked per role and week. Multi-word terms are matched as phrases.
+SKILL_TERMS = [
+    "sql", "python", "r", "scala", "java", "excel", "tableau", "power bi", "looker", "qlik",
+    "pandas", "numpy", "spark", "pyspark", "hadoop", "kafka", "airflow", "dbt", "snowflake",
+    "bigquery", "redshift", "databricks", "aws", "azure", "gcp", "docker", "kubernetes",
+    "terraform", "git", "etl", "elt", "data warehouse", "data modeling", "data pipelines",
+    "statistics", "a/b testing", "machine learning", "deep learning", "nlp", "computer vision",
+    "tensorflow", "pytorch", "scikit-learn", "llm", "mlops", "postgresql", "mysql", "mongodb",
+    "nosql", "api", "linux", "agile", "communication", "stakeholder management", "visualization"
+]
+
+_TERM_PATTERNS = [(term, re.compile(r"(?<![\w/])" + re.escape(term) + r"(?![\w/])")) for term in SKILL_TERMS]
+
+
+# --- NORMALIZATION ---
+def normalize_role(title):
+    """Same buckets as the app's simplify_title(), with everything else as 'Other'."""
+    title_lower = str(title).lower()
+    if 'data scientist' in title_lower:
+        return 'Data Scientist'
+    elif 'data engineer' in title_lower:
+        return 'Data Engineer'
+    elif 'data analyst' in title_lower or 'data analytics' in title_lower:
+        return 'Data Analyst'
+    elif 'machine learning' in title_lower or 'ml engineer' in title_lower:
+        return 'Machine Learning Engineer'
+    return 'Other'
+
+
+def week_start(date_posted):
+    """Monday of the posting's week as YYYY-MM-DD (this week when the date is unknown)."""
+    try:
+        day = datetime.fromisoformat(str(date_posted)[:10]).date()
+    except ValueError:
+        day = date.today()
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def skill_terms(description):
+    text = str(description or "").lower()
+    return [term for term, pattern in _TERM_PATTERNS if pattern.search(text)]
+
+
+# --- INCREMENTAL AGGREGATES ---
+def record_job(cursor, values, dup_of=None):
+    """Fold one written job into the weekly aggregate tables.
+
+    `values` is the writer's INSERT tuple (title, company, location, link,
+    source, date_posted, work_type, employment_type, description). Each link
+    is counted once, on first sight, and near-duplicates (dup_of set) are not
+    counted at all. Runs inside the caller's transaction. Returns True if the
+    job was counted.
+    """
+    title, _, _, link, source, date_posted, work_type, _, description = values
+    if dup_of or not link:
+        return False
+
+    cursor.execute("INSERT IGNORE INTO analytics_seen (link) VALUES (%s)", (link,))
+    if cursor.rowcount != 1:
+        return False  # re-scrape of a job that is already counted
+
+    week = week_start(date_posted)
+    role = normalize_role(title)
+    cursor.execute(
+        """
+            INSERT INTO role_weekly_counts (week, role, source, work_type, jobs)
+            VALUES (%s, %s, %s, %s, 1)
+            ON DUPLICATE KEY UPDATE jobs = jobs + 1
+        """,
+        # LinkedInSource stores "LinkedIn", jobspy's site name "linkedin"; count them as one source
+        (week, role, source.lower() if source else "N/A", work_type or "N/A")
+    )
+    for term in skill_terms(description):
+        cursor.execute(
+            """
+                INSERT INTO role_keyword_weekly (week, role, keyword, jobs)
+                VALUES (%s, %s, %s, 1)
+                ON DUPLICATE KEY UPDATE jobs = jobs + 1
+            """,
+            (week, role, term)
+        )
+    return True
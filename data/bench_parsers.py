@@ -0,0 +1,89 @@
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time as tm
+
+from parsers import BACKENDS, parse_job_cards
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+# --- FIXTURES ---
+def load_pages(pattern):
+    pages = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding="utf-8") as file:
+            pages.append(file.read())
+    return pages
+
+
+# --- BENCHMARK ---
+def max_rss_kib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+
+
+def bench_backend(backend, pages, repeat):
+    baseline = max_rss_kib()
+
+    # Warm-up pass so import/selector setup is not timed
+    for html in pages:
+        parse_job_cards(html, backend)
+
+    cards = 0
+    start_time = tm.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            cards += len(parse_job_cards(html, backend))
+    elapsed = tm.perf_counter() - start_time
+
+    return {
+        "backend": backend,
+        "cards": cards,
+        "seconds": elapsed,
+        "cards_per_sec": cards / elapsed if elapsed else 0.0,
+        # Peak RSS growth while parsing, so C-level (libxml2/lexbor) allocations count too
+        "peak_rss_kib": max_rss_kib() - baseline
+    }
+
+
+def bench_isolated(backend, pages_glob, repeat):
+    """Run one backend in a fresh interpreter so its peak RSS isn't shared with the others."""
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--backend", backend,
+                          "--pages", pages_glob, "--repeat", str(repeat), "--json"],
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        raise SystemExit(out.stderr)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare job card parser backends on saved search pages.")
+    parser.add_argument("--pages", default=os.path.join(FIXTURE_DIR, "search_*.html"),
+                        help="Glob of saved LinkedIn search result pages")
+    parser.add_argument("--repeat", type=int, default=50, help="Passes over the fixture set per backend")
+    parser.add_argument("--backend", choices=list(BACKENDS), help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    if not pages:
+        raise SystemExit(f"No fixture pages matched {args.pages}")
+
+    if args.backend:
+        print(json.dumps(bench_backend(args.backend, pages, args.repeat)))
+        return
+
+    print(f"{len(pages)} page(s), {args.repeat} pass(es) per backend, one process each")
+    print(f"{'backend':<12}{'cards':>8}{'seconds':>10}{'cards/sec':>12}{'peak RSS KiB':>14}")
+    for backend in BACKENDS:
+        result = bench_isolated(backend, args.pages, args.repeat)
+        print(f"{result['backend']:<12}{result['cards']:>8}{result['seconds']:>10.3f}"
+              f"{result['cards_per_sec']:>12.0f}{result['peak_rss_kib']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
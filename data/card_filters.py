@@ -0,0 +1,138 @@
+import re
+import logging
+from datetime import date, datetime
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Title fragments the app's simplify_title() maps to a role; anything else is never shown
+DEFAULT_TITLE_INCLUDE = ["data scientist", "data engineer", "data analyst", "data analytics",
+                         "machine learning", "ml engineer"]
+
+CARDS_DROPPED = metrics.counter("scraper_cards_dropped_total", "Search cards dropped before detail fetch, by rule")
+
+_JOB_ID = re.compile(r"(?:-|/view/|currentJobId=)(\d{6,})")
+
+_SENIORITY = [
+    ("senior", re.compile(r"\b(senior|sr|lead|principal|staff|head|director)\b")),
+    ("junior", re.compile(r"\b(junior|jr|graduate|intern|internship|trainee)\b")),
+    ("entry", re.compile(r"\b(entry|associate)\b"))
+]
+
+# Common function words; two hits in one language are needed to call a title non-English
+_STOPWORDS = {
+    "de": {"und", "für", "mit", "der", "die", "das", "im", "bei"},
+    "fr": {"et", "pour", "le", "la", "les", "des", "du"},
+    "es": {"para", "el", "los", "las", "con", "del"},
+    "nl": {"voor", "met", "het", "bij", "van"},
+    "pt": {"com", "do", "da", "em"},
+    "it": {"per", "il", "lo", "della", "di"}
+}
+# Gender tags required on German and French job titles, e.g. "(m/w/d)", "(H/F)"
+_GENDER_TAGS = [
+    ("de", re.compile(r"\((?:m|w|d)/(?:m|w|d)(?:/(?:m|w|d))?\)", re.IGNORECASE)),
+    ("fr", re.compile(r"\((?:h|f)/(?:h|f)\)", re.IGNORECASE))
+]
+_EN_STOPWORDS = {"and", "for", "with", "the", "of", "in", "at", "to"}
+
+
+# --- CARD ATTRIBUTES ---
+def job_id(card):
+    """LinkedIn's numeric job ID from the card URL, falling back to the URL itself."""
+    match = _JOB_ID.search(card.get("job_url", ""))
+    return match.group(1) if match else card.get("job_url")
+
+
+def seniority(title):
+    title = title.lower()
+    for level, pattern in _SENIORITY:
+        if pattern.search(title):
+            return level
+    return "mid"
+
+
+def guess_language(text):
+    """Language code for a short title on strong evidence only, else None (kept by the filter).
+
+    Strong evidence is a non-Latin script, a German/French gender tag, or at
+    least two stopwords of one language and no English ones. A single short
+    word is too often part of a company name ("La Fitness", "Il Makiage").
+    """
+    if re.search(r"[^\x00-\u024f\W]", text):
+        return "other"  # non-Latin script
+    for lang, pattern in _GENDER_TAGS:
+        if pattern.search(text):
+            return lang
+    tokens = set(re.findall(r"\w+", text.lower()))
+    if tokens & _EN_STOPWORDS:
+        return "en"
+    scores = {lang: len(tokens & words) for lang, words in _STOPWORDS.items()}
+    lang, score = max(scores.items(), key=lambda item: item[1])
+    return lang if score >= 2 else None
+
+
+def card_age_days(card, today=None):
+    try:
+        posted = datetime.fromisoformat(card.get("date", "")).date()
+    except ValueError:
+        return None
+    return ((today or date.today()) - posted).days
+
+
+# --- FILTER STAGE ---
+def build_rules(config, today=None):
+    """Ordered (name, predicate) pairs; a card is dropped by the first predicate that rejects it."""
+    include = [t.lower() for t in config.get("title_include", DEFAULT_TITLE_INCLUDE)]
+    exclude = [t.lower() for t in config.get("title_exclude", [])]
+    levels = set(config.get("seniority", []))
+    max_age = config.get("max_age_days")
+    languages = set(config.get("languages", []))
+
+    rules = []
+    if exclude:
+        rules.append(("title_exclude", lambda c: not any(t in c["title"].lower() for t in exclude)))
+    if include:
+        rules.append(("title_include", lambda c: any(t in c["title"].lower() for t in include)))
+    if levels:
+        rules.append(("seniority", lambda c: seniority(c["title"]) in levels))
+    if max_age is not None:
+        rules.append(("age", lambda c: (card_age_days(c, today) or 0) <= int(max_age)))
+    if languages:
+        rules.append(("language", lambda c: guess_language(c["title"]) in languages | {None}))
+    return rules
+
+
+def filter_cards(cards, config, today=None, seen=None):
+    """Drop cards that would waste a detail page load.
+
+    Dedups by LinkedIn job ID across every keyword/location query in the run
+    (and across runs when a persistent `seen` set is passed), then applies the
+    title, seniority, age and language rules from config.
+    Returns the kept cards and a {rule: dropped count} dict.
+    """
+    rules = build_rules(config, today)
+    dropped = {"duplicate": 0, **{name: 0 for name, _ in rules}}
+    seen = set() if seen is None else seen
+    kept = []
+
+    for card in cards:
+        key = job_id(card)
+        if key in seen:
+            dropped["duplicate"] += 1
+            continue
+        seen.add(key)
+
+        for name, keep in rules:
+            if not keep(card):
+                dropped[name] += 1
+                break
+        else:
+            kept.append(card)
+
+    for name, count in dropped.items():
+        if count:
+            CARDS_DROPPED.inc(count, rule=name)
+    logger.info("Card filter kept %d of %d cards", len(kept), len(cards),
+                extra={"event": "card_filter", "dropped": dropped})
+    return kept, dropped
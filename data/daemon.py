@@ -0,0 +1,202 @@
+import os
+import signal
+import asyncio
+import logging
+import argparse
+from contextlib import asynccontextmanager
+import time as tm
+from datetime import datetime
+
+from playwright.async_api import async_playwright
+
+import metrics
+from engine import ScrapeEngine, build_sources
+from storage import load_config, enable_db_pool, job_log
+from web import LinkedInSource, launch_browser
+
+logger = logging.getLogger(__name__)
+
+DAEMON_DEFAULTS = {
+    "interval_minutes": 360,     # default gap between runs of the same keyword
+    "keyword_intervals": {},     # per-keyword overrides, in minutes
+    "recycle_after_pages": 200,  # relaunch Chromium after this many detail pages
+    "status_port": 8080,
+    "db_pool_size": 5,
+    "max_seen_ids": 50000        # job IDs remembered across cycles to skip re-scraping
+}
+
+BROWSER_LAUNCHES = metrics.counter("scraper_browser_launches_total", "Chromium launches by the daemon")
+
+
+# --- WARM BROWSER ---
+class WarmBrowser:
+    """Keep one Chromium context alive across cycles, relaunching it after N pages.
+
+    Pages are counted as they are handed out. Once the limit is reached, new
+    pages wait until the in-flight ones close, then the browser is relaunched,
+    so recycling happens between batches even in the middle of a long run.
+    """
+
+    def __init__(self, recycle_after_pages):
+        self.recycle_after_pages = recycle_after_pages
+        self.playwright = None
+        self.browser = None
+        self._context = None
+        self.pages_served = 0
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def start(self):
+        self.playwright = await async_playwright().start()
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._cond:
+            if self.browser is not None and self.pages_served >= self.recycle_after_pages:
+                await self._cond.wait_for(lambda: self.in_flight == 0)
+                if self.pages_served >= self.recycle_after_pages:  # not already recycled by another waiter
+                    logger.info("Recycling browser after %d pages", self.pages_served)
+                    await self.close_browser()
+            if self.browser is None:
+                self.browser, self._context = await launch_browser(self.playwright)
+                BROWSER_LAUNCHES.inc()
+            self.pages_served += 1
+            self.in_flight += 1
+            context = self._context
+
+        try:
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                await page.close()
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    async def close_browser(self):
+        if self.browser is not None:
+            await self.browser.close()
+        self.browser, self._context, self.pages_served = None, None, 0
+
+    async def stop(self):
+        await self.close_browser()
+        if self.playwright is not None:
+            await self.playwright.stop()
+
+
+# --- SCHEDULER ---
+class ScraperDaemon:
+    def __init__(self, config):
+        self.config = config
+        self.settings = {**DAEMON_DEFAULTS, **config.get("daemon", {})}
+        self.browser = WarmBrowser(self.settings["recycle_after_pages"])
+        self.sources = build_sources(config)
+        for source in self.sources:
+            if isinstance(source, LinkedInSource):
+                source.warm = self.browser
+        self.seen = set()
+        self.next_run = {keyword: tm.monotonic() for keyword in config["keywords"]}
+        self.last_run = {}
+        self.running = None
+        self.cycles = 0
+        self.consecutive_failures = 0
+        self.started_at = datetime.now()
+        self.stopping = asyncio.Event()
+
+    def interval(self, keyword):
+        minutes = self.settings["keyword_intervals"].get(keyword, self.settings["interval_minutes"])
+        return float(minutes) * 60
+
+    async def run_keyword(self, keyword):
+        start = tm.perf_counter()
+        keyword_config = dict(self.config, keywords=[keyword])
+
+        if len(self.seen) > self.settings["max_seen_ids"]:
+            self.seen.clear()
+        # Blocked or failed jobs are dropped from `seen` by the engine and retried next cycle
+        stats = await ScrapeEngine(self.sources, keyword_config, seen=self.seen).run()
+
+        job_log.flush(f"daemon/{keyword}")
+        metrics.dump_profiles()
+        self.last_run[keyword] = {
+            "finished": datetime.now().isoformat(timespec="seconds"),
+            "seconds": round(tm.perf_counter() - start, 2),
+            "scraped": stats["kept"],
+            "outcomes": stats["outcomes"],
+            "dropped": stats["dropped"]
+        }
+        if stats["outcomes"].get("failed") and not stats["outcomes"].get("saved"):
+            # Every page failing usually means a dead browser; the caller recycles it
+            raise RuntimeError(f"all {stats['outcomes']['failed']} detail fetches failed")
+
+    async def run_forever(self):
+        await self.browser.start()
+        try:
+            while not self.stopping.is_set():
+                keyword = min(self.next_run, key=self.next_run.get)
+                delay = self.next_run[keyword] - tm.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self.stopping.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                self.running = keyword
+                try:
+                    await self.run_keyword(keyword)
+                    self.consecutive_failures = 0
+                except Exception as e:
+                    self.consecutive_failures += 1
+                    logger.error("Scheduled run for '%s' failed: %s", keyword, e, exc_info=True)
+                    # A broken browser is the usual culprit; start fresh next time
+                    await self.browser.close_browser()
+                finally:
+                    self.running = None
+                    self.cycles += 1
+                    self.next_run[keyword] = tm.monotonic() + self.interval(keyword)
+        finally:
+            await self.browser.stop()
+
+    def status(self):
+        now = tm.monotonic()
+        return {
+            "healthy": self.consecutive_failures < 3,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "cycles": self.cycles,
+            "running": self.running,
+            "consecutive_failures": self.consecutive_failures,
+            "browser_pages_served": self.browser.pages_served,
+            "browser_pages_open": self.browser.in_flight,
+            "browser_launches": BROWSER_LAUNCHES.total(),
+            "seen_ids": len(self.seen),
+            "next_run_in_seconds": {k: max(0, round(v - now)) for k, v in self.next_run.items()},
+            "last_run": self.last_run
+        }
+
+
+async def main(config_path):
+    config = load_config(config_path)
+    daemon = ScraperDaemon(config)
+
+    enable_db_pool(daemon.settings["db_pool_size"])
+    metrics.set_status_provider(daemon.status)
+    metrics.serve_metrics(int(os.getenv("METRICS_PORT", daemon.settings["status_port"])))
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, daemon.stopping.set)
+
+    logger.info("Scraper daemon started for keywords %s", list(daemon.next_run))
+    await daemon.run_forever()
+    logger.info("Scraper daemon stopped after %d cycles", daemon.cycles)
+
+
+# --- ENTRY POINT ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the scraper sources on a schedule with a warm browser.")
+    parser.add_argument("--config", default="config.json")
+    args = parser.parse_args()
+    asyncio.run(main(args.config))
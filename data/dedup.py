@@ -0,0 +1,122 @@
+import re
+import hashlib
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS    # 16 bands x 8 rows ~ 0.7 Jaccard threshold
+SHINGLE_SIZE = 5
+THRESHOLD = 0.8             # estimated Jaccard at which two postings are the same job
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _permutations(count, seed=1):
+    # Deterministic (a, b) pairs so signatures stay comparable across runs and processes
+    perms = []
+    for i in range(count):
+        digest = hashlib.blake2b(f"{seed}:{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little") % _MERSENNE or 1
+        b = int.from_bytes(digest[8:], "little") % _MERSENNE
+        perms.append((a, b))
+    return perms
+
+
+_PERMS = _permutations(NUM_PERM)
+
+
+# --- SIGNATURES ---
+def shingles(text, k=SHINGLE_SIZE):
+    tokens = _TOKEN.findall(str(text).lower())
+    if len(tokens) < k:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+def minhash_signature(text):
+    """128-value MinHash signature of the text's word 5-shingles, or None if it has no words."""
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+              for s in shingles(text)]
+    if not hashes:
+        return None
+    return array("I", (min((a * h + b) % _MERSENNE for h in hashes) & _MAX_HASH for a, b in _PERMS))
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def band_keys(signature):
+    """One LSH bucket key per band; postings sharing any key are candidate duplicates."""
+    return [
+        f"{band:02d}:" + hashlib.blake2b(signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=12).hexdigest()
+        for band in range(BANDS)
+    ]
+
+
+def to_bytes(signature):
+    return signature.tobytes()
+
+
+def from_bytes(blob):
+    signature = array("I")
+    signature.frombytes(bytes(blob))
+    return signature
+
+
+def dedup_text(job):
+    """Text a posting is fingerprinted on, or None when there is no usable description."""
+    description = job.get("description")
+    if not description or description in ("N/A", "CAPTCHA Blocked"):
+        return None
+    return f"{job.get('title', '')} {description}"
+
+
+# --- INCREMENTAL INDEX ---
+def index_job(cursor, job):
+    """Fingerprint a job that was just written and link it to its duplicate cluster.
+
+    Looks up only the postings that share an LSH bucket with this one, so the
+    cost does not grow with the size of the jobs table. Sets jobs.minhash and
+    jobs.dup_of (the link of the cluster's canonical posting, NULL if this is
+    canonical) and records the bucket keys in job_lsh. Runs inside the
+    caller's transaction; returns dup_of.
+    """
+    link = job.get("job_url")
+    text = dedup_text(job)
+    signature = minhash_signature(text) if text else None
+    if not link or signature is None:
+        return None
+
+    keys = band_keys(signature)
+    placeholders = ", ".join(["%s"] * len(keys))
+    cursor.execute(
+        f"""
+            SELECT j.link, j.minhash, j.dup_of
+            FROM jobs j JOIN (SELECT DISTINCT link FROM job_lsh WHERE band IN ({placeholders})) c ON c.link = j.link
+            WHERE j.link <> %s AND j.minhash IS NOT NULL
+        """,
+        (*keys, link)
+    )
+
+    dup_of, best = None, THRESHOLD
+    for other_link, other_sig, other_dup_of in cursor.fetchall():
+        if other_dup_of == link:
+            continue  # already points at this posting as its canonical copy
+        score = similarity(signature, from_bytes(other_sig))
+        if score >= best:
+            dup_of, best = other_dup_of or other_link, score
+
+    cursor.execute("UPDATE jobs SET minhash = %s, dup_of = %s WHERE link = %s", (to_bytes(signature), dup_of, link))
+    for key in keys:
+        cursor.execute("INSERT IGNORE INTO job_lsh (band, link) VALUES (%s, %s)", (key, link))
+
+    if dup_of:
+        logger.debug("Near-duplicate of %s (%.2f): %s", dup_of, best, link)
+    return dup_of
@@ -0,0 +1,243 @@
+import os
+import random
+import asyncio
+import logging
+import argparse
+import time as tm
+
+import metrics
+from card_filters import filter_cards, job_id
+from log_config import setup_logging
+from sources import JobSpySource
+from storage import load_config, save_job, job_log
+
+logger = logging.getLogger(__name__)
+
+WRITE_QUEUE = metrics.gauge("scraper_write_queue_depth", "Normalized jobs waiting for the shared writer")
+
+WRITE_QUEUE_SIZE = 500  # back-pressure: detail fetches pause while the writer catches up
+
+
+# --- RATE LIMITING ---
+class RateLimiter:
+    """Space calls at least `interval` seconds apart, plus up to `jitter` random seconds."""
+
+    def __init__(self, interval, jitter=0.0):
+        self.interval = interval
+        self.jitter = jitter
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            delay = self._next - tm.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = tm.monotonic() + self.interval + random.uniform(0, self.jitter)
+
+
+# --- SOURCES ---
+def source_options(config, name):
+    """Constructor overrides for one source from config["sources"][name]."""
+    options = config.get("sources", {}).get(name, {})
+    return {
+        "rate_limit": options.get("rate_limit_seconds"),
+        "jitter": options.get("jitter_seconds"),
+        "concurrency": options.get("concurrency")
+    }
+
+
+def build_sources(config, names=None):
+    """Sources named on the command line, else every key of config["sources"] (LinkedIn by default)."""
+    sources = []
+    for name in names or list(config.get("sources", {"linkedin": {}})):
+        if name == "linkedin":
+            from web import LinkedInSource  # Playwright is only needed for this source
+            sources.append(LinkedInSource(**source_options(config, name)))
+        elif name.startswith("jobspy:"):
+            sources.append(JobSpySource(name.split(":", 1)[1], **source_options(config, name)))
+        else:
+            raise ValueError(f"Unknown source '{name}'")
+    return sources
+
+
+# --- ENGINE ---
+class ScrapeEngine:
+    """Run several sources concurrently into one card filter, dedup index and writer.
+
+    Each source searches keyword x location under its own rate limit and
+    fetches details with its own concurrency, while search results of later
+    queries overlap with detail fetches of earlier ones. Normalized jobs go
+    through a bounded queue to a single writer thread, which keeps the
+    MinHash index consistent and the event loop free of DB I/O. Job IDs are
+    shared across sources through `seen`; jobs that fail or hit a CAPTCHA are
+    forgotten again when the run ends so a later run retries them.
+    """
+
+    def __init__(self, sources, config, seen=None, writer=save_job):
+        self.sources = sources
+        self.config = config
+        self.seen = set() if seen is None else seen
+        self.writer = writer
+        self.queue = None
+        self.outcomes = {}
+        self.retry = set()
+
+    async def run(self):
+        self.queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+        writer = asyncio.create_task(self._write())
+        tasks = [asyncio.create_task(self._run_source(source)) for source in self.sources]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            # One failing source must not leave the others filling a queue nobody drains
+            await _cancel(tasks)
+            await self.queue.put(None)
+            await writer
+            self.seen.difference_update(self.retry)
+
+        stats = {"found": 0, "kept": 0, "dropped": {}, "outcomes": self.outcomes,
+                 "sources": dict(zip((s.name for s in self.sources), results))}
+        for result in results:
+            stats["found"] += result["found"]
+            stats["kept"] += result["kept"]
+            for rule, count in result["dropped"].items():
+                stats["dropped"][rule] = stats["dropped"].get(rule, 0) + count
+        return stats
+
+    async def _run_source(self, source):
+        result = {"found": 0, "kept": 0, "dropped": {}}
+        try:
+            await source.start(self.config)
+        except Exception as e:
+            logger.error("Source %s failed to start: %s", source.name, e)
+            return result
+
+        limiter = RateLimiter(source.rate_limit, source.jitter)
+        slots = asyncio.Semaphore(source.concurrency)
+        fetches = []
+        try:
+            for keyword in self.config["keywords"]:
+                for location in self.config["locations"]:
+                    await limiter.wait()
+                    try:
+                        cards = await source.search(keyword, location, self.config)
+                    except Exception as e:
+                        logger.error("Search failed on %s for '%s' in '%s': %s", source.name, keyword, location or "any", e)
+                        continue
+
+                    kept, dropped = filter_cards(cards, self.config, seen=self.seen)
+                    result["found"] += len(cards)
+                    result["kept"] += len(kept)
+                    for rule, count in dropped.items():
+                        result["dropped"][rule] = result["dropped"].get(rule, 0) + count
+                    fetches.extend(asyncio.create_task(self._fetch(source, card, slots)) for card in kept)
+
+            await asyncio.gather(*fetches)
+        finally:
+            # Nothing may still be using the browser when the source stops
+            await _cancel(fetches)
+            try:
+                await source.stop()
+            except Exception as e:
+                logger.warning("Source %s failed to stop cleanly: %s", source.name, e)
+        logger.info("Source %s found %d cards, kept %d", source.name, result["found"], result["kept"],
+                    extra={"event": "source_done", "source": source.name, "dropped": result["dropped"]})
+        return result
+
+    async def _fetch(self, source, card, slots):
+        waiting = True
+        metrics.QUEUE_DEPTH.inc()
+        try:
+            async with slots:
+                metrics.QUEUE_DEPTH.dec()
+                waiting = False
+                start = tm.perf_counter()
+                try:
+                    card = await source.details(card)
+                    if source.blocked(card):
+                        self._done(source, card, "captcha", start)
+                        return
+                    job = source.normalize(card)
+                except Exception as e:
+                    logger.error("Error processing job %s: %s", card.get("job_url"), e, extra={"event": "job_failed"})
+                    self._done(source, card, "failed", start)
+                    return
+
+            await self.queue.put((source, card, job, start))
+            WRITE_QUEUE.inc()
+        except asyncio.CancelledError:
+            if waiting:
+                metrics.QUEUE_DEPTH.dec()
+            self.retry.add(job_id(card))
+            raise
+
+    async def _write(self):
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            WRITE_QUEUE.dec()
+            source, card, job, start = item
+            try:
+                saved = await asyncio.to_thread(self._save, job)
+            except Exception as e:
+                logger.error("Writer failed for %s: %s", job.get("job_url"), e)
+                saved = False
+            self._done(source, card, "saved" if saved else "db_error", start)
+
+    def _save(self, job):
+        with metrics.profile_stage("db_write"):  # runs in the writer thread, so it needs its own profiler
+            return self.writer(job)
+
+    def _done(self, source, card, outcome, start):
+        if outcome != "saved":
+            self.retry.add(job_id(card))
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        metrics.JOBS.inc(source=source.label, outcome=outcome)
+        metrics.JOB_LATENCY.observe(tm.perf_counter() - start, source=source.label)
+
+
+async def _cancel(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_engine(config, sources, batch="engine run"):
+    """One full run over every keyword/location: log totals and write the metrics report if configured."""
+    start_time = tm.perf_counter()
+    stats = {"found": 0, "kept": 0}
+    try:
+        with metrics.profile_stage("engine"):
+            stats = await ScrapeEngine(sources, config).run()
+    except Exception as e:
+        logger.error(f"Fatal error in scraper: {e}")
+    finally:
+        elapsed = tm.perf_counter() - start_time
+        job_log.flush(batch)
+        metrics.dump_profiles()
+        saved = sum(metrics.JOBS.value(source=label, outcome="saved") for label in {s.label for s in sources})
+        logger.info(f"Scraping completed in {elapsed:.2f} seconds")
+        logger.info(f"Total jobs saved: {saved} of {stats['kept']} kept, {stats['found']} found "
+                    f"(CAPTCHA rate {metrics.captcha_rate():.1%})")
+
+        report_path = config.get("metrics_report") or os.getenv("METRICS_REPORT")
+        if report_path:
+            metrics.write_report(report_path, elapsed_seconds=elapsed, jobs_found=stats["found"])
+    return stats
+
+
+# --- ENTRY POINT ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape several job sources concurrently into the shared writer.")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--sources", help="Comma-separated, e.g. linkedin,jobspy:indeed (default: config \"sources\")")
+    args = parser.parse_args()
+
+    setup_logging()
+    config = load_config(args.config)
+    sources = build_sources(config, args.sources.split(",") if args.sources else None)
+    metrics.start_from_env()
+    metrics.start_py_spy()
+    asyncio.run(run_engine(config, sources, batch="+".join(source.name for source in sources)))
@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+# --- FORMATTERS ---
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Enqueue records untouched so message formatting happens on the listener thread.
+
+    The stock QueueHandler formats in the caller so records can be pickled; the
+    queue here is in-process, so that work can be deferred as well.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+# --- SETUP ---
+def setup_logging(level=None, fmt=None):
+    """Route all logging through a queue drained by a background listener.
+
+    LOG_LEVEL and LOG_FORMAT ("json" or "text") override the defaults.
+    Calling this more than once is a no-op.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    fmt = fmt or os.getenv("LOG_FORMAT", "json")
+
+    stream = logging.StreamHandler(sys.stdout)
+    if fmt == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
+
+
+# --- PER-JOB SAMPLING ---
+class JobLogSampler:
+    """Aggregate per-job success lines and emit one summary per batch.
+
+    Only every `sample_every`-th success is logged individually (as a sample);
+    failures should still be logged directly by the caller.
+    """
+
+    def __init__(self, logger, sample_every=None):
+        self.logger = logger
+        self.sample_every = sample_every or int(os.getenv("LOG_SAMPLE_EVERY", "50"))
+        self._counts = {}
+        self._seen = 0
+        self._lock = threading.Lock()
+
+    def success(self, job, source):
+        with self._lock:
+            self._counts[source] = self._counts.get(source, 0) + 1
+            self._seen += 1
+            sampled = (self._seen - 1) % self.sample_every == 0
+        if sampled and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Inserted job (sampled 1/%d): %s at %s", self.sample_every,
+                             job.get("title"), job.get("company"),
+                             extra={"event": "job_saved", "source": source, "job_url": job.get("job_url")})
+
+    def flush(self, batch):
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if counts:
+            self.logger.info("Batch %s: saved %d jobs", batch, sum(counts.values()),
+                             extra={"event": "batch_summary", "batch": batch, "saved_by_source": counts})
+        return counts
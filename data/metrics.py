@@ -0,0 +1,360 @@
+import os
+import json
+import random
+import atexit
+import pstats
+import time as tm
+import cProfile
+import logging
+import threading
+import subprocess
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+RESERVOIR_SIZE = 1024  # samples kept per series for quantiles, so a long-lived daemon stays bounded
+
+
+# --- METRIC TYPES ---
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(_label_key(labels), 0)
+
+    def total(self):
+        return sum(self._values.values())
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+    def snapshot(self):
+        return {_format_labels(key) or "total": value for _, key, value in self.samples()}
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def __init__(self, name, help_text):
+        super().__init__(name, help_text)
+        self._peaks = {}
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            value = self._values.get(key, 0) + amount
+            self._values[key] = value
+            self._peaks[key] = max(self._peaks.get(key, 0), value)
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                _format_labels(key) or "total": {"current": value, "peak": self._peaks.get(key, 0)}
+                for key, value in self._values.items()
+            }
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, {"counts": [0] * len(self.buckets), "count": 0, "sum": 0.0,
+                                                   "max": value, "values": []})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["count"] += 1
+            series["sum"] += value
+            series["max"] = max(series["max"], value)
+            # Reservoir sampling: every observation has an equal chance of being in the sample
+            if len(series["values"]) < RESERVOIR_SIZE:
+                series["values"].append(value)
+            else:
+                slot = random.randrange(series["count"])
+                if slot < RESERVOIR_SIZE:
+                    series["values"][slot] = value
+
+    @contextmanager
+    def time(self, **labels):
+        start = tm.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(tm.perf_counter() - start, **labels)
+
+    def quantile(self, q):
+        """Quantile across every label set (from the sampled values), or None if nothing was observed."""
+        with self._lock:
+            values = sorted(v for series in self._series.values() for v in series["values"])
+        return values[int(q * (len(values) - 1))] if values else None
+
+    def samples(self):
+        out = []
+        with self._lock:
+            for key, series in self._series.items():
+                for bound, count in zip(self.buckets, series["counts"]):
+                    out.append((f"{self.name}_bucket", key + (("le", bound),), count))
+                out.append((f"{self.name}_bucket", key + (("le", "+Inf"),), series["count"]))
+                out.append((f"{self.name}_sum", key, series["sum"]))
+                out.append((f"{self.name}_count", key, series["count"]))
+        return out
+
+    def snapshot(self):
+        report = {}
+        with self._lock:
+            for key, series in self._series.items():
+                values = sorted(series["values"])
+                if not values:
+                    continue
+                report[_format_labels(key) or "total"] = {
+                    "count": series["count"],
+                    "sum": series["sum"],
+                    "mean": series["sum"] / series["count"],
+                    "p50": values[int(0.50 * (len(values) - 1))],
+                    "p90": values[int(0.90 * (len(values) - 1))],
+                    "p99": values[int(0.99 * (len(values) - 1))],
+                    "max": series["max"]
+                }
+        return report
+
+
+# --- REGISTRY ---
+REGISTRY = {}
+
+
+def _register(metric):
+    REGISTRY[metric.name] = metric
+    return metric
+
+
+def counter(name, help_text):
+    return REGISTRY.get(name) or _register(Counter(name, help_text))
+
+
+def gauge(name, help_text):
+    return REGISTRY.get(name) or _register(Gauge(name, help_text))
+
+
+def histogram(name, help_text, buckets=DEFAULT_BUCKETS):
+    return REGISTRY.get(name) or _register(Histogram(name, help_text, buckets))
+
+
+# Pipeline metrics shared by every scraper and writer
+SEARCH_LATENCY = histogram("scraper_search_latency_seconds", "Time to fetch one search results page")
+PAGE_LOAD = histogram("scraper_page_load_seconds", "Time to navigate to a job detail page")
+EXTRACTION = histogram("scraper_extraction_seconds", "Time to extract detail fields from a loaded page")
+JOB_LATENCY = histogram("scraper_job_seconds", "Time to handle one job once it has a slot, end to end")
+DB_WRITE = histogram("scraper_db_write_seconds", "Time to write one job to the database")
+QUEUE_DEPTH = gauge("scraper_queue_depth", "Jobs waiting for a detail scraping slot")
+JOBS = counter("scraper_jobs_total", "Jobs handled, by outcome")
+CAPTCHAS = counter("scraper_captcha_total", "Detail pages blocked by a CAPTCHA")
+RETRIES = counter("scraper_retries_total", "Retried operations, by stage")
+
+
+def reset():
+    """Drop all recorded samples, keeping the registered metrics."""
+    for metric in REGISTRY.values():
+        with metric._lock:
+            if isinstance(metric, Histogram):
+                metric._series.clear()
+            else:
+                metric._values.clear()
+                if isinstance(metric, Gauge):
+                    metric._peaks.clear()
+
+
+def captcha_rate():
+    attempted = JOBS.total()
+    return CAPTCHAS.total() / attempted if attempted else 0.0
+
+
+# --- EXPORT ---
+def render_prometheus():
+    lines = []
+    for metric in REGISTRY.values():
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, key, value in metric.samples():
+            lines.append(f"{name}{_format_labels(key)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def build_report(**extra):
+    report = {name: metric.snapshot() for name, metric in REGISTRY.items()}
+    report["captcha_rate"] = captcha_rate()
+    report.update(extra)
+    return report
+
+
+def write_report(path, **extra):
+    with open(path, "w") as file:
+        json.dump(build_report(**extra), file, indent=2, default=str)
+    logger.info(f"Metrics report written to {path}")
+
+
+_status_provider = None
+
+
+def set_status_provider(provider):
+    """Register a callable returning a status dict; its "healthy" key drives /health."""
+    global _status_provider
+    _status_provider = provider
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        code = 200
+        if self.path.startswith("/health"):
+            healthy = _status_provider().get("healthy", True) if _status_provider else True
+            code = 200 if healthy else 503
+            body, content_type = (b"ok" if healthy else b"unhealthy"), "text/plain"
+        elif self.path.startswith("/status"):
+            status = _status_provider() if _status_provider else {"healthy": True}
+            body, content_type = json.dumps(status, default=str).encode(), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, content_type = render_prometheus().encode(), "text/plain; version=0.0.4"
+        elif self.path.startswith("/report"):
+            body, content_type = json.dumps(build_report(), default=str).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host="0.0.0.0"):
+    """Serve /metrics (Prometheus text), /report (JSON), /health and /status from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Metrics endpoint listening on {host}:{port}")
+    return server
+
+
+def start_from_env(env=os.environ):
+    """Start the metrics endpoint if METRICS_PORT is set."""
+    port = env.get("METRICS_PORT")
+    return serve_metrics(int(port)) if port else None
+
+
+# --- PROFILING ---
+_profilers = {}   # (stage, thread id) -> cProfile.Profile, accumulated across calls
+_busy = set()     # profilers currently enabled; dump_profiles() leaves them for the next dump
+_profilers_lock = threading.Lock()
+_profiled = threading.local()
+
+
+def _profile_wanted(stage, env):
+    wanted = {s.strip() for s in env.get("SCRAPER_PROFILE", "").split(",") if s.strip()}
+    return stage in wanted or "all" in wanted
+
+
+@contextmanager
+def profile_stage(stage, env=os.environ):
+    """Profile a pipeline stage with cProfile when SCRAPER_PROFILE names it.
+
+    SCRAPER_PROFILE is a comma-separated list of stages (or "all"). cProfile
+    only sees the thread that enabled it, so each thread gets its own
+    profiler per stage; stages running in worker threads (searches, the DB
+    writer) are captured and several stages can be profiled at once.
+    Repeated calls accumulate, and a stage nested in another profiled stage
+    on the same thread is left to the outer one. dump_profiles() writes the
+    results; it runs after every engine run and at exit.
+    """
+    if not _profile_wanted(stage, env) or getattr(_profiled, "stage", None):
+        yield
+        return
+
+    key = (stage, threading.get_ident())
+    with _profilers_lock:
+        if not _profilers:
+            atexit.register(dump_profiles, env)
+        profiler = _profilers.setdefault(key, cProfile.Profile())
+        _busy.add(key)
+    _profiled.stage = stage
+    try:
+        profiler.enable()
+    except ValueError:  # another profiler already owns the process (Python 3.12+)
+        _profiled.stage = None
+        with _profilers_lock:
+            _busy.discard(key)
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _profiled.stage = None
+        with _profilers_lock:
+            _busy.discard(key)
+
+
+def dump_profiles(env=os.environ):
+    """Merge each stage's per-thread profilers into SCRAPER_PROFILE_DIR/<stage>-<pid>.prof."""
+    with _profilers_lock:
+        stages = {}
+        for key, profiler in _profilers.items():
+            if key not in _busy:
+                stages.setdefault(key[0], []).append(profiler)
+        if not stages:
+            return
+        out_dir = env.get("SCRAPER_PROFILE_DIR", "profiles")
+        os.makedirs(out_dir, exist_ok=True)
+        for stage, profilers in stages.items():
+            path = os.path.join(out_dir, f"{stage}-{os.getpid()}.prof")
+            pstats.Stats(*profilers).dump_stats(path)
+            logger.info(f"Profile for stage '{stage}' written to {path}")
+
+
+def start_py_spy(env=os.environ):
+    """Attach py-spy to this process when SCRAPER_PY_SPY names an output file."""
+    output = env.get("SCRAPER_PY_SPY")
+    if not output:
+        return None
+    try:
+        return subprocess.Popen(["py-spy", "record", "--pid", str(os.getpid()), "--output", output])
+    except FileNotFoundError:
+        logger.warning("SCRAPER_PY_SPY is set but py-spy is not installed")
+        return None
@@ -0,0 +1,170 @@
+import logging
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Optional fast backends; BeautifulSoup is always available as the fallback
+try:
+    # Lexbor: the Modest-based selectolax.parser raises ImportError from selectolax 1.0
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    CSSSelector = None
+
+# --- SELECTORS ---
+CARD_SELECTOR = "div.base-card"
+LINK_SELECTOR = "a.base-card__full-link"
+TITLE_SELECTOR = "h3.base-search-card__title"
+COMPANY_SELECTOR = "h4.base-search-card__subtitle"
+LOCATION_SELECTOR = "span.job-search-card__location"
+TIME_SELECTOR = "time"
+
+if CSSSelector is not None:
+    _LXML_CARD = CSSSelector(CARD_SELECTOR)
+    _LXML_LINK = CSSSelector(LINK_SELECTOR)
+    _LXML_TITLE = CSSSelector(TITLE_SELECTOR)
+    _LXML_COMPANY = CSSSelector(COMPANY_SELECTOR)
+    _LXML_LOCATION = CSSSelector(LOCATION_SELECTOR)
+    _LXML_TIME = CSSSelector(TIME_SELECTOR)
+
+
+# --- SHARED HELPERS ---
+def classify_work_type(location_text):
+    location_text = location_text.lower()
+    if "remote" in location_text:
+        return "Remote"
+    elif "onsite" in location_text:
+        return "Onsite"
+    elif "hybrid" in location_text:
+        return "Hybrid"
+    return "N/A"
+
+
+def build_card(href, title, company, location, date):
+    """Assemble a job card dict from already-extracted (stripped) field values."""
+    return {
+        "job_url": href.split("?")[0],
+        "title": title or "N/A",
+        "company": company or "N/A",
+        "location": location or "N/A",
+        "date": date or str(datetime.today().date()),
+        "work_type": classify_work_type(location) if location else "N/A"
+    }
+
+
+# --- BACKENDS ---
+def _parse_selectolax(html):
+    cards = []
+    for node in HTMLParser(html).css(CARD_SELECTOR):
+        try:
+            link = node.css_first(LINK_SELECTOR)
+            href = link.attributes.get("href") if link else None
+            if not href:
+                continue
+
+            title = node.css_first(TITLE_SELECTOR)
+            company = node.css_first(COMPANY_SELECTOR)
+            location = node.css_first(LOCATION_SELECTOR)
+            time_tag = node.css_first(TIME_SELECTOR)
+
+            cards.append(build_card(
+                href,
+                title.text().strip() if title else None,
+                company.text().strip() if company else None,
+                location.text().strip() if location else None,
+                time_tag.attributes.get("datetime") if time_tag else None
+            ))
+        except Exception as e:
+            logger.error(f"Error parsing job element: {e}")
+    return cards
+
+
+def _parse_lxml(html):
+    def first(selector, node):
+        found = selector(node)
+        return found[0] if found else None
+
+    cards = []
+    for node in _LXML_CARD(lxml.html.fromstring(html)):
+        try:
+            link = first(_LXML_LINK, node)
+            href = link.get("href") if link is not None else None
+            if not href:
+                continue
+
+            title = first(_LXML_TITLE, node)
+            company = first(_LXML_COMPANY, node)
+            location = first(_LXML_LOCATION, node)
+            time_tag = first(_LXML_TIME, node)
+
+            cards.append(build_card(
+                href,
+                title.text_content().strip() if title is not None else None,
+                company.text_content().strip() if company is not None else None,
+                location.text_content().strip() if location is not None else None,
+                time_tag.get("datetime") if time_tag is not None else None
+            ))
+        except Exception as e:
+            logger.error(f"Error parsing job element: {e}")
+    return cards
+
+
+def _parse_bs4(html):
+    cards = []
+    soup = BeautifulSoup(html, "html.parser")
+    for node in soup.select(CARD_SELECTOR):
+        try:
+            link = node.select_one(LINK_SELECTOR)
+            if not link or not link.get("href"):
+                continue
+
+            title = node.select_one(TITLE_SELECTOR)
+            company = node.select_one(COMPANY_SELECTOR)
+            location = node.select_one(LOCATION_SELECTOR)
+            time_tag = node.select_one(TIME_SELECTOR)
+
+            cards.append(build_card(
+                link["href"],
+                title.text.strip() if title else None,
+                company.text.strip() if company else None,
+                location.text.strip() if location else None,
+                time_tag.get("datetime") if time_tag else None
+            ))
+        except Exception as e:
+            logger.error(f"Error parsing job element: {e}")
+    return cards
+
+
+BACKENDS = {"bs4": _parse_bs4}
+if CSSSelector is not None:
+    BACKENDS["lxml"] = _parse_lxml
+if HTMLParser is not None:
+    BACKENDS["selectolax"] = _parse_selectolax
+
+# Fastest available backend wins
+DEFAULT_BACKEND = next(name for name in ("selectolax", "lxml", "bs4") if name in BACKENDS)
+
+
+# --- PUBLIC API ---
+_announced = set()
+
+
+def parse_job_cards(html, backend=None):
+    """Extract job cards from a LinkedIn search results page.
+
+    Uses the fastest installed backend unless one is named explicitly.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown or unavailable parser backend: {backend}")
+    if backend not in _announced:
+        _announced.add(backend)
+        logger.info("Parsing job cards with the %s backend (available: %s)", backend, ", ".join(BACKENDS))
+    return BACKENDS[backend](html)
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from datetime import datetime
+
+import metrics
+
+try:
+    from jobspy import scrape_jobs
+except ImportError:  # only needed by JobSpySource
+    scrape_jobs = None
+
+logger = logging.getLogger(__name__)
+
+
+# --- SOURCE INTERFACE ---
+class JobSource:
+    """One job board plugged into the ScrapeEngine.
+
+    search() returns cards for one keyword/location; each card needs at least
+    title, job_url and date (ISO string, may be empty) for the card filters.
+    details() enriches a kept card and normalize() maps it onto the writer's
+    fields (storage.JOB_FIELDS). The engine owns rate limiting, concurrency,
+    dedup and writing, so a source only deals with its own board.
+    """
+
+    name = "source"    # key under config["sources"]
+    label = "source"   # value stored in jobs.source and used as the metrics label
+    rate_limit = 1.0   # minimum seconds between two searches
+    jitter = 0.0       # extra random delay on top of rate_limit
+    concurrency = 1    # detail fetches in flight at once
+
+    def __init__(self, rate_limit=None, jitter=None, concurrency=None):
+        if rate_limit is not None:
+            self.rate_limit = float(rate_limit)
+        if jitter is not None:
+            self.jitter = float(jitter)
+        if concurrency is not None:
+            self.concurrency = int(concurrency)
+
+    async def start(self, config):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def search(self, keyword, location, config):
+        raise NotImplementedError
+
+    async def details(self, card):
+        return card
+
+    def normalize(self, card):
+        raise NotImplementedError
+
+    def blocked(self, card):
+        """True when details() hit a CAPTCHA; the card is retried on a later run instead of saved."""
+        return False
+
+
+# --- JOBSPY ---
+def _missing(value):
+    return value is None or value != value or str(value) in ("nan", "NaN", "NaT", "N/A")
+
+
+def sanitize(value):
+    return "N/A" if _missing(value) else str(value).strip()
+
+
+def sanitize_date(value):
+    if _missing(value):
+        return None
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    try:
+        return datetime.fromisoformat(str(value)).strftime("%Y-%m-%d")
+    except ValueError as e:
+        logger.warning("Date parsing failed for value %r: %s", value, e)
+        return None
+
+
+class JobSpySource(JobSource):
+    """LinkedIn/Indeed through python-jobspy; descriptions come with the search results."""
+
+    rate_limit = 2.0
+
+    def __init__(self, site, **kwargs):
+        super().__init__(**kwargs)
+        self.site = site
+        self.name = f"jobspy:{site}"
+        self.label = site
+
+    async def start(self, config):
+        if scrape_jobs is None:
+            raise RuntimeError("python-jobspy is not installed")
+
+    def _search(self, keyword, location, config):
+        with metrics.profile_stage("search"), metrics.SEARCH_LATENCY.time(source=self.site):
+            df = scrape_jobs(
+                site_name=[self.site],
+                search_term=keyword,
+                location=location,
+                results_wanted=int(config.get("results_wanted", 20)),
+                hours_old=int(config['days_to_scrape']) * 24,
+                country_indeed='USA',
+                linkedin_fetch_description=True
+            )
+        if df.empty:
+            return []
+
+        # Filter by description keywords if provided
+        if config.get("desc_words"):
+            df = df[df["description"].str.contains('|'.join(config["desc_words"]), case=False, na=False)]
+
+        cards = []
+        for row in df.to_dict("records"):
+            row["title"] = sanitize(row.get("title"))
+            row["job_url"] = sanitize(row.get("job_url"))
+            row["date"] = sanitize_date(row.get("date_posted")) or ""
+            cards.append(row)
+        return cards
+
+    async def search(self, keyword, location, config):
+        return await asyncio.to_thread(self._search, keyword, location, config)
+
+    def normalize(self, card):
+        return {
+            "title": card["title"],
+            "company": sanitize(card.get("company")),
+            "location": sanitize(card.get("location")),
+            "job_url": card["job_url"],
+            "source": self.label,
+            "date_posted": card["date"] or None,
+            "work_type": sanitize(card.get("work_type")),
+            "employment_type": sanitize(card.get("employment_type")),
+            "description": sanitize(card.get("description"))
+        }
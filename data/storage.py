@@ -0,0 +1,92 @@
+import os
+import json
+import logging
+import time as tm
+
+import mysql.connector
+from mysql.connector import pooling
+
+import metrics
+from dedup import index_job
+from analytics import record_job
+from log_config import JobLogSampler
+
+logger = logging.getLogger(__name__)
+job_log = JobLogSampler(logger)
+
+# Fields every source's normalize() must produce; save_job() writes them in this order
+JOB_FIELDS = ["title", "company", "location", "job_url", "source", "date_posted",
+              "work_type", "employment_type", "description"]
+
+INSERT_JOB = """
+    INSERT INTO jobs (title, company, location, link, source, date_posted, work_type, employment_type, description)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE description = VALUES(description)
+"""
+
+
+# --- CONFIGURATION ---
+def load_config(config_file):
+    with open(config_file) as file:
+        return json.load(file)
+
+
+# --- DATABASE CONNECTION ---
+db_pool = None
+
+def db_settings():
+    return dict(
+            host=os.getenv("DB_HOST", "localhost"),
+            user=os.getenv("DB_USER", "root"),
+            password=os.getenv("DB_PASSWORD", "Timmy@2013"),
+            database=os.getenv("DB_NAME", "job_scraper")
+    )
+
+def enable_db_pool(size=5):
+    """Reuse connections across saves; close() on a pooled connection returns it to the pool."""
+    global db_pool
+    if db_pool is None:
+        db_pool = pooling.MySQLConnectionPool(pool_name="scraper", pool_size=size, **db_settings())
+    return db_pool
+
+def get_db_connection():
+    if db_pool is not None:
+        return db_pool.get_connection()
+    return mysql.connector.connect(**db_settings())
+
+
+# --- WRITER ---
+def save_job(job):
+    """Insert or refresh one normalized job, then index it for dedup and fold it into the aggregates.
+
+    Shared by every source. Returns True if the row was committed.
+    """
+    start = tm.perf_counter()
+    saved = False
+    conn = cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        values = tuple(job.get(field) for field in JOB_FIELDS)
+        cursor.execute(INSERT_JOB, values)
+        # Index and aggregates land together or not at all; a half-counted job would be
+        # marked in analytics_seen and never counted again
+        cursor.execute("SAVEPOINT post_insert")
+        try:
+            record_job(cursor, values, dup_of=index_job(cursor, job))
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT post_insert")
+            logger.warning("Post-insert indexing failed for %s: %s", job.get("job_url"), e)
+        conn.commit()
+        saved = True
+        job_log.success(job, job.get("source"))
+    except Exception as e:
+        logger.error("Failed to insert into DB: %s", e, extra={"event": "db_error", "job_url": job.get("job_url")})
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if conn is not None:
+            conn.close()
+        metrics.DB_WRITE.observe(tm.perf_counter() - start, source=job.get("source"))
+    return saved
@@ -0,0 +1,130 @@
+import os
+import time as tm
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LINKEDIN_ORIGIN = "https://www.linkedin.com"
+
+
+# --- FIXTURES ---
+def load_fixture(name, fixture_dir=FIXTURE_DIR):
+    with open(os.path.join(fixture_dir, name), encoding="utf-8") as file:
+        return file.read()
+
+
+# --- STUB SERVER ---
+class StubLinkedIn:
+    """Serve recorded LinkedIn search and job pages from a local HTTP server.
+
+    Links inside the recorded search page are rewritten to point back at the
+    stub, so the scrapers can be aimed at it by setting "base_url" in their
+    config. Latency, HTTP errors and CAPTCHA pages are injected at the given
+    rates using a seeded RNG, so runs are repeatable.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, captcha_rate=0.0, seed=0, fixture_dir=FIXTURE_DIR):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.captcha_rate = captcha_rate
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.requests = {"search": 0, "detail": 0, "error": 0, "captcha": 0}
+
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.base_url = f"http://{host}:{self.server.server_address[1]}"
+        self.search_html = load_fixture("search_page.html", fixture_dir).replace(LINKEDIN_ORIGIN, self.base_url)
+        self.detail_html = load_fixture("job_detail.html", fixture_dir)
+        self.captcha_html = load_fixture("captcha.html", fixture_dir)
+
+    def _roll(self, rate):
+        with self.rng_lock:
+            return self.rng.random() < rate
+
+    def _delay(self):
+        with self.rng_lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+        if delay > 0:
+            tm.sleep(delay)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._delay()
+                path = self.path.split("?")[0]
+
+                if path.startswith("/jobs/search"):
+                    kind, body = "search", stub.search_html
+                elif path.startswith("/jobs/view/"):
+                    kind, body = "detail", stub.detail_html
+                    if stub._roll(stub.captcha_rate):
+                        kind, body = "captcha", stub.captcha_html
+                else:
+                    self.send_error(404)
+                    return
+
+                failed = stub._roll(stub.error_rate)
+                with stub.rng_lock:
+                    stub.requests[kind] += 1
+                    stub.requests["error"] += failed
+                if failed:
+                    self.send_error(503)
+                    return
+
+                payload = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info(f"Stub LinkedIn serving fixtures at {self.base_url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# --- ENTRY POINT ---
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Serve recorded LinkedIn pages locally.")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base delay per request (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay per request (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--captcha-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stub = StubLinkedIn(port=args.port, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, captcha_rate=args.captcha_rate, seed=args.seed)
+    stub.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stub.stop()
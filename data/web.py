@@ -1,137 +1,56 @@
-import os
 import time as tm
-import json
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
 from dotenv import load_dotenv
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from playwright_stealth import stealth_async
 import logging
 import random
-import mysql.connector
 import asyncio
-from asyncio import Semaphore
+from contextlib import asynccontextmanager
+
+import metrics
+from engine import run_engine, source_options
+from log_config import setup_logging
+from parsers import parse_job_cards
+from sources import JobSource
+from storage import load_config
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-sem = Semaphore(6)  # Increased concurrency
-
-# --- CONFIGURATION ---
-def load_config(config_file):
-    with open(config_file) as file:
-        return json.load(file)
-
-# --- DATABASE CONNECTION ---
-def get_db_connection():
-    return mysql.connector.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            user=os.getenv("DB_USER", "root"),
-            password=os.getenv("DB_PASSWORD", "Timmy@2013"),
-            database=os.getenv("DB_NAME", "job_scraper")
-    )
-
-# --- SAVE JOB TO DATABASE ---
-def save_to_db(job):
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        query = """
-            INSERT INTO jobs (title, company, location, link, source, date_posted, work_type, employment_type, description)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE description = VALUES(description)
-        """
-
-        values = (
-            job.get("title"),
-            job.get("company"),
-            job.get("location"),
-            job.get("job_url"),
-            "LinkedIn",
-            job.get("date"),
-            job.get("work_type", "N/A"),
-            job.get("employment_type", "N/A"),
-            job.get("description", "N/A")
-        )
-
-        cursor.execute(query, values)
-        conn.commit()
-        logger.info(f"✅ Inserted: {job['title']} at {job['company']}")
-    except Exception as e:
-        logger.error(f"❌ Failed to insert into DB: {e}")
-    finally:
-        cursor.close()
-        conn.close()
-
 # --- JOB CARD SCRAPER ---
-def get_job_cards(config):
+def get_job_cards(config, session=None):
+    """Search cards for every keyword x location; pass a session to reuse its connections across calls."""
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
         "Accept-Language": "en-US,en;q=0.9",
     }
 
     jobs = []
-    session = requests.Session()
-
-    for keyword in config['keywords']:
-        for location in config['locations']:
-            location_param = f"&location={location}" if location else ""
-            url = f"https://www.linkedin.com/jobs/search/?keywords={keyword}{location_param}&f_TPR=r{config['date_range']}&position=1&pageNum=0"
-
-            try:
-                tm.sleep(random.uniform(1, 2))
-                response = session.get(url, headers=headers, timeout=15)
-                response.raise_for_status()
-
-                soup = BeautifulSoup(response.text, "html.parser")
-                job_elements = soup.find_all("div", class_="base-card")
-
-                for job_elem in job_elements:
-                    try:
-                        link_tag = job_elem.find("a", class_="base-card__full-link")
-                        if not link_tag or not link_tag.get("href"):
-                            continue
-
-                        title = job_elem.find("h3", class_="base-search-card__title")
-                        company = job_elem.find("h4", class_="base-search-card__subtitle")
-                        location_span = job_elem.find("span", class_="job-search-card__location")
-                        time_tag = job_elem.find("time")
-
-                        work_type = "N/A"
-                        if location_span:
-                            location_text = location_span.text.strip().lower()
-                            if "remote" in location_text:
-                                work_type = "Remote"
-                            elif "onsite" in location_text:
-                                work_type = "Onsite"
-                            elif "hybrid" in location_text:
-                                work_type = "Hybrid"
-
-                        job = {
-                            "job_url": link_tag["href"].split("?")[0],
-                            "title": title.text.strip() if title else "N/A",
-                            "company": company.text.strip() if company else "N/A",
-                            "location": location_span.text.strip() if location_span else "N/A",
-                            "date": time_tag["datetime"] if time_tag else str(datetime.today().date()),
-                            "work_type": work_type
-                        }
-                        jobs.append(job)
-
-                    except Exception as e:
-                        logger.error(f"Error parsing job element: {e}")
-                        continue
-
-            except requests.RequestException as e:
-                logger.error(f"Error fetching jobs for {keyword} in {location or 'global'}: {e}")
-                continue
+    session = session or requests.Session()
+    base_url = config.get("base_url", "https://www.linkedin.com")
+    min_delay, max_delay = config.get("search_delay", [1, 2])
+
+    with metrics.profile_stage("search"):  # usually runs under asyncio.to_thread
+        for keyword in config['keywords']:
+            for location in config['locations']:
+                location_param = f"&location={location}" if location else ""
+                url = f"{base_url}/jobs/search/?keywords={keyword}{location_param}&f_TPR=r{config['date_range']}&position=1&pageNum=0"
+
+                try:
+                    tm.sleep(random.uniform(min_delay, max_delay))
+                    with metrics.SEARCH_LATENCY.time(source="LinkedIn"):
+                        response = session.get(url, headers=headers, timeout=15)
+                    response.raise_for_status()
+
+                    jobs.extend(parse_job_cards(response.text, config.get("parser_backend")))
+
+                except requests.RequestException as e:
+                    logger.error(f"Error fetching jobs for {keyword} in {location or 'global'}: {e}")
+                    continue
 
     return jobs
 
@@ -144,92 +63,191 @@ async def try_goto(page, url, retries=1):
         except Exception as e:
             if attempt == retries:
                 raise
+            metrics.RETRIES.inc(stage="goto")
             await page.wait_for_timeout(random.randint(1000, 3000))
 
 # --- JOB DETAILS SCRAPER ---
+DETAIL_WAIT_MS = 5000
+
+# Runs inside the page and returns every detail field, the CAPTCHA status and
+# per-field timings (ms) in a single round-trip.
+EXTRACT_DETAILS_JS = """
+() => {
+    const timings = {};
+    const timed = (name, fn) => {
+        const start = performance.now();
+        const value = fn();
+        timings[name] = performance.now() - start;
+        return value;
+    };
+    const criterion = (label) => {
+        for (const el of document.querySelectorAll("h3, span")) {
+            if (el.textContent.trim() === label && el.nextElementSibling) {
+                return el.nextElementSibling.innerText.trim();
+            }
+        }
+        return null;
+    };
+
+    const captcha = timed("captcha", () => document.querySelector("input[name=captcha]") !== null);
+    const description = timed("description", () => {
+        const el = document.querySelector("div.description__text");
+        return el ? el.innerText.trim() : null;
+    });
+    const work_type = timed("work_type", () => criterion("Work type"));
+    const employment_type = timed("employment_type", () => criterion("Employment type"));
+
+    return {captcha, description, work_type, employment_type, timings};
+}
+"""
+
 async def scrape_job_details(page, url):
+    timings = {}
+
+    start = tm.perf_counter()
     await try_goto(page, url)
+    timings["goto"] = tm.perf_counter() - start
+    metrics.PAGE_LOAD.observe(timings["goto"])
 
-    if "captcha" in page.url or await page.locator("input[name=captcha]").count() > 0:
-        logger.warning(f"🛑 CAPTCHA detected at {url}")
+    start = tm.perf_counter()
+    try:
+        # "attached": the CAPTCHA input is type=hidden and never becomes visible
+        await page.wait_for_selector("div.description__text, input[name=captcha]", state="attached",
+                                     timeout=DETAIL_WAIT_MS)
+    except PlaywrightTimeoutError:
+        logger.debug("Description not rendered within %dms at %s", DETAIL_WAIT_MS, url)
+    timings["wait"] = tm.perf_counter() - start
+
+    start = tm.perf_counter()
+    fields = await page.evaluate(EXTRACT_DETAILS_JS)
+    timings["extract"] = tm.perf_counter() - start
+    metrics.EXTRACTION.observe(timings["extract"])
+    for name, ms in fields["timings"].items():
+        timings[f"field_{name}"] = ms / 1000
+
+    logger.debug("Detail timings for %s: %s", url, timings, extra={"event": "detail_timings", "timings": timings})
+
+    if "captcha" in page.url or fields["captcha"]:
+        logger.warning("CAPTCHA detected at %s", url, extra={"event": "captcha", "job_url": url})
+        metrics.CAPTCHAS.inc()
         return {
             "description": "CAPTCHA Blocked",
             "work_type": "N/A",
-            "employment_type": "N/A"
+            "employment_type": "N/A",
+            "timings": timings
         }
 
-    try:
-        await page.wait_for_selector("div.description__text", timeout=5000)
-        description = await page.locator("div.description__text").inner_text()
-    except:
-        description = "N/A"
-
-    job_info = {"description": description.strip()}
-
-    try:
-        job_info["work_type"] = await page.locator("span:has-text('Work type') + span").inner_text()
-    except:
-        job_info["work_type"] = "N/A"
-
-    try:
-        job_info["employment_type"] = await page.locator("span:has-text('Employment type') + span").inner_text()
-    except:
-        job_info["employment_type"] = "N/A"
+    return {
+        "description": fields["description"] or "N/A",
+        "work_type": fields["work_type"] or "N/A",
+        "employment_type": fields["employment_type"] or "N/A",
+        "timings": timings
+    }
 
-    return job_info
+# --- BROWSER ---
+async def launch_browser(p):
+    browser = await p.chromium.launch(headless=True)
+    context = await browser.new_context(
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        viewport={"width": 1920, "height": 1080},
+        java_script_enabled=True,
+        bypass_csp=True,
+        ignore_https_errors=True
+    )
 
-# --- JOB HANDLER ---
-async def process_job(job, context):
-    async with sem:
+    await stealth_async(context)
+    return browser, context
+
+# --- SOURCE ---
+class LinkedInSource(JobSource):
+    """Guest LinkedIn search pages for cards, Playwright for the detail pages.
+
+    Pass a WarmBrowser to take pages from it (it counts and recycles them);
+    otherwise a browser is launched on the first detail page and closed when
+    the run stops.
+    """
+
+    name = "linkedin"
+    label = "LinkedIn"
+    rate_limit = 1.0
+    jitter = 1.0
+    concurrency = 6
+
+    def __init__(self, browser=None, **kwargs):
+        super().__init__(**kwargs)
+        self.warm = browser
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.session = None
+        self._lock = None
+
+    async def start(self, config):
+        self._lock = asyncio.Lock()
+        self.session = requests.Session()  # keep-alive across searches; only one search runs at a time
+
+    async def _context(self):
+        async with self._lock:
+            if self.context is None:
+                self.playwright = await async_playwright().start()
+                self.browser, self.context = await launch_browser(self.playwright)
+            return self.context
+
+    @asynccontextmanager
+    async def _page(self):
+        if self.warm is not None:
+            async with self.warm.page() as page:
+                yield page
+            return
+        page = await (await self._context()).new_page()
         try:
-            page = await context.new_page()
-            details = await scrape_job_details(page, job["job_url"])
-            job.update(details)
-            save_to_db(job)
+            yield page
+        finally:
             await page.close()
-        except Exception as e:
-            logger.error(f"❌ Error processing job {job['job_url']}: {e}")
+
+    async def stop(self):
+        if self.browser is not None:
+            await self.browser.close()
+        if self.playwright is not None:
+            await self.playwright.stop()
+        if self.session is not None:
+            self.session.close()
+        self.playwright, self.browser, self.context, self.session = None, None, None, None
+
+    async def search(self, keyword, location, config):
+        # The engine's rate limiter spaces the searches, so skip get_job_cards' own delay
+        query = dict(config, keywords=[keyword], locations=[location], search_delay=[0, 0])
+        return await asyncio.to_thread(get_job_cards, query, self.session)
+
+    async def details(self, card):
+        async with self._page() as page:
+            card.update(await scrape_job_details(page, card["job_url"]))
+        return card
+
+    def blocked(self, card):
+        return card.get("description") == "CAPTCHA Blocked"
+
+    def normalize(self, card):
+        return {
+            "title": card.get("title"),
+            "company": card.get("company"),
+            "location": card.get("location"),
+            "job_url": card.get("job_url"),
+            "source": self.label,
+            "date_posted": card.get("date"),
+            "work_type": card.get("work_type", "N/A"),
+            "employment_type": card.get("employment_type", "N/A"),
+            "description": card.get("description", "N/A")
+        }
 
 # --- MAIN SCRAPER FUNCTION ---
 async def run_scraper(config_path):
-    start_time = tm.perf_counter()
-
-    try:
-        config = load_config(config_path)
-        logger.info(f"Starting scraper with config: {config}")
-
-        logger.info("Fetching job listings from LinkedIn...")
-        all_jobs = get_job_cards(config)
-        logger.info(f"Found {len(all_jobs)} total jobs in initial search")
-
-        if not all_jobs:
-            logger.warning("No jobs found. Possible issues:")
-            return
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                viewport={"width": 1920, "height": 1080},
-                java_script_enabled=True,
-                bypass_csp=True,
-                ignore_https_errors=True
-            )
-
-            await stealth_async(context)
-
-            tasks = [process_job(job, context) for job in all_jobs]
-            await asyncio.gather(*tasks)
-
-            await browser.close()
-
-    except Exception as e:
-        logger.error(f"Fatal error in scraper: {e}")
-    finally:
-        end_time = tm.perf_counter()
-        logger.info(f"Scraping completed in {end_time - start_time:.2f} seconds")
-        logger.info(f"Total jobs processed: {len(all_jobs)}")
+    config = load_config(config_path)
+    logger.info(f"Starting scraper with config: {config}")
+    return await run_engine(config, [LinkedInSource(**source_options(config, "linkedin"))], batch="LinkedIn run")
 
 # --- ENTRY POINT ---
 if __name__ == "__main__":
-    asyncio.run(run_scraper("config.json"))
\ No newline at end of file
+    metrics.start_from_env()
+    metrics.start_py_spy()
+    asyncio.run(run_scraper("config.json"))
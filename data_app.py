@@ -1,20 +1,22 @@
 import streamlit as st
-import pandas as pd
 import requests
 import os
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from sklearn.feature_extraction.text import TfidfVectorizer
-from collections import Counter
-import numpy as np
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+from job_index import JobIndex, INDEX_DIR
+from role_artifacts import clean_role_jobs, compute_keywords, wordcloud_path
+
+# pandas, scikit-learn and wordcloud are imported lazily on the paths
+# that use them; Streamlit reruns this script on every interaction.
 
 # Load environment variables
 load_dotenv()
 
 # --- Gemini API Function (v2.0 Flash) ---
-def generate_with_gemini(prompt):
-    api_key = st.secrets["GM_API_TOKEN"]  # Use your actual key or st.secrets
+def generate_with_gemini(prompt, api_key=None):
+    api_key = api_key or st.secrets["GM_API_TOKEN"]  # Use your actual key or st.secrets
     api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
 
     headers = {
@@ -51,30 +53,12 @@ def generate_with_gemini(prompt):
 
 # --- Load & Clean Jobs from CSV (Cached) ---
 @st.cache_data
-def simplify_title(title):
-    title_lower = str(title).lower()
-    if 'data scientist' in title_lower:
-        return 'Data Scientist'
-    elif 'data engineer' in title_lower:
-        return 'Data Engineer'
-    elif 'data analyst' in title_lower or 'data analytics' in title_lower:
-        return 'Data Analyst'
-    elif 'machine learning' in title_lower or 'ml engineer' in title_lower:
-        return 'Machine Learning Engineer'
-    else:
-        return title
+def fetch_and_clean_jobs(role, version=None):
+    import pandas as pd
 
-@st.cache_data
-def fetch_and_clean_jobs(role):
     try:
         df = pd.read_csv("clean_jobs.csv")
-        df.drop(columns=['work_type', 'employment_type'], inplace=True, errors='ignore')
-        df['title'] = df['title'].apply(simplify_title)
-        df = df[df['title'].str.contains(role, case=False, na=False)]
-        df = df.dropna(subset=['description'])
-        df['description'] = df['description'].str.strip()
-        df.drop_duplicates(subset=['title', 'description'], inplace=True)
-        return df
+        return clean_role_jobs(df, role)
     except Exception as e:
         st.error(f"CSV Load Error: {str(e)}")
         return pd.DataFrame()
@@ -83,22 +67,105 @@ def fetch_and_clean_jobs(role):
 @st.cache_data
 def extract_keywords(texts, n=10):
     try:
-        combined_text = " ".join(texts)
-        words = [word.lower() for word in combined_text.split() if word.isalpha() and len(word) > 2]
-        word_freq = Counter(words)
-
-        vectorizer = TfidfVectorizer(max_features=50, stop_words='english')
-        tfidf_matrix = vectorizer.fit_transform(texts)
-        feature_names = vectorizer.get_feature_names_out()
-        tfidf_scores = np.sum(tfidf_matrix, axis=0).A1
-
-        keywords = {word: score * 5 + word_freq.get(word, 0) for word, score in zip(feature_names, tfidf_scores)}
-        sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)
-        return [word[0] for word in sorted_keywords[:n]]
+        return compute_keywords(texts, n)
     except Exception as e:
         st.error(f"Keyword Extraction Error: {str(e)}")
         return []
 
+# --- Word Cloud Fallback (when the export hasn't precomputed one) ---
+@st.cache_data
+def wordcloud_png(role, version=None):
+    import io
+    from wordcloud import WordCloud
+
+    combined_descriptions = " ".join(fetch_and_clean_jobs(role, version)["description"].dropna().tolist())
+    image = WordCloud(width=800, height=400, background_color='white', stopwords='english').generate(combined_descriptions).to_image()
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+# --- Session Result Store ---
+# Generations are keyed by (role, level, dataset version) and run on a shared
+# thread pool, so reruns redraw stored results instead of calling Gemini again.
+@st.cache_resource
+def gemini_executor():
+    return ThreadPoolExecutor(max_workers=4)
+
+def dataset_version(path="clean_jobs.csv"):
+    try:
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    except OSError:
+        return "missing"
+
+def stored_results(key):
+    """Finished generations for key, after harvesting background calls that completed since the last rerun."""
+    store = st.session_state.setdefault("results", {})
+    pending = st.session_state.setdefault("pending", {})
+    for (pending_key, kind), future in list(pending.items()):
+        if future.done():
+            store.setdefault(pending_key, {})[kind] = future.result()
+            del pending[(pending_key, kind)]
+    return store.setdefault(key, {})
+
+def is_pending(key, kind=None):
+    return any(k == key and (kind is None or kd == kind) for k, kd in st.session_state.get("pending", {}))
+
+def generation_failed(result):
+    # generate_with_gemini reports failures as text instead of raising
+    return result.startswith("⚠️")
+
+def request_generation(key, kind, prompt, retry=False):
+    """Start a background call unless one is stored or running; on user action (retry) a stored failure is retried."""
+    results = stored_results(key)
+    if retry and kind in results and generation_failed(results[kind]):
+        del results[kind]
+    if kind in results or is_pending(key, kind):
+        return
+    future = gemini_executor().submit(generate_with_gemini, prompt, st.secrets["GM_API_TOKEN"])
+    st.session_state.pending[(key, kind)] = future
+
+def show_result(key, kind, render):
+    results = stored_results(key)
+    if kind in results:
+        if generation_failed(results[kind]):
+            st.error(results[kind])
+        else:
+            render(results[kind])
+    elif is_pending(key, kind):
+        st.info("⏳ Generating...")
+
+# --- CV Matching (index built at export time) ---
+MATCH_TOP_K = 20
+
+@st.cache_resource(max_entries=1)  # only the current index version stays mapped
+def load_job_index(version=None):
+    return JobIndex() if JobIndex.exists() else None
+
+@st.cache_data
+def match_postings(cv_text, role, version=None, k=MATCH_TOP_K):
+    index = load_job_index(version)
+    return index.search(cv_text, k=k, role=role) if index else []
+
+def job_context(role, version, matches):
+    """Descriptions that ground the prompts: the matched postings when a CV was given, else every posting for the role."""
+    if matches:
+        return " ".join(posting["description"] for _, posting in matches)
+    jobs_df = fetch_and_clean_jobs(role, version)
+    return " ".join(jobs_df["description"].dropna().tolist()) if not jobs_df.empty else ""
+
+# --- Market Trends (pre-aggregated at ingest) ---
+@st.cache_data
+def load_trends(version=None):
+    import pandas as pd
+
+    try:
+        counts = pd.read_csv("role_weekly_counts.csv", parse_dates=["week"])
+        keywords = pd.read_csv("role_keyword_weekly.csv", parse_dates=["week"])
+        return counts, keywords
+    except FileNotFoundError:
+        return None, None
+
 # --- Streamlit UI ---
 st.set_page_config(page_title="AI CV Builder", page_icon="📝", layout="wide")
 
@@ -141,26 +208,31 @@ with col1:
 with col2:
     level = st.selectbox("Select Level", ["Entry Level", "Junior", "Senior"])
 
-# Main Generation
-if st.button("Generate Professional About Me", type="primary"):
-    jobs_df = fetch_and_clean_jobs(role)
+version = dataset_version()
 
-    if not jobs_df.empty:
-        job_descriptions = jobs_df["description"].dropna().tolist()
-        combined_descriptions = " ".join(job_descriptions)
+# CV Matching
+cv_text = st.text_area("Paste your CV or skills (optional)",
+                       help=f"Only the {MATCH_TOP_K} most similar postings are then used to write your content")
+matches = match_postings(cv_text, role, dataset_version(os.path.join(INDEX_DIR, "offsets.npy"))) if cv_text.strip() else []
+if cv_text.strip() and not matches:
+    st.caption("No matching postings found (or the index hasn't been built); using every posting for this role.")
+if matches:
+    with st.expander(f"🎯 {len(matches)} postings most similar to your CV"):
+        for score, posting in matches:
+            st.markdown(f"- **{posting['title']}** at {posting['company']} · similarity {score:.2f}")
 
-        with st.spinner("Analyzing job descriptions and generating content..."):
-            st.subheader("☁️ Word Cloud for This Role")
-            wordcloud = WordCloud(width=800, height=400, background_color='white', stopwords='english').generate(combined_descriptions)
-            fig, ax = plt.subplots(figsize=(10, 5))
-            ax.imshow(wordcloud, interpolation='bilinear')
-            ax.axis('off')
-            st.pyplot(fig)
+corpus_id = hashlib.sha1(cv_text.encode()).hexdigest()[:12] if matches else "all"
+key = (role, level, version, corpus_id)
+requested = st.session_state.setdefault("requested", set())
 
-            st.markdown("---")
+# Main Generation
+if st.button("Generate Professional About Me", type="primary"):
+    combined_descriptions = job_context(role, version, matches)
+
+    if combined_descriptions:
 
-            # About Me Generation
-            prompt = f"""You are a professional CV writer. Generate a compelling 'About Me' section for a {level} {role} based on these job requirements:
+        # About Me Generation
+        prompt = f"""You are a professional CV writer. Generate a compelling 'About Me' section for a {level} {role} based on these job requirements:
 
 Job Descriptions:
 {combined_descriptions}
@@ -172,12 +244,10 @@ Guidelines:
 4. Format: Complete sentences, no bullet points
 5. Avoid: Generic phrases like "team player"
 """
-            about_me = generate_with_gemini(prompt)
-            st.subheader("✨ Your AI-Tailored 'About Me'")
-            st.success(about_me)
+        request_generation(key, "about_me", prompt, retry=True)
 
-            # Technical Skills Generation
-            skill_prompt = f"""
+        # Technical Skills Generation
+        skill_prompt = f"""
 Extract the top 5 technical skills for a {level} {role} from these job descriptions:
 
 {combined_descriptions}
@@ -186,30 +256,46 @@ Format:
 - Markdown bullet list
 - Each skill should include a 1-sentence explanation
 """
-            skills = generate_with_gemini(skill_prompt)
+        request_generation(key, "skills", skill_prompt, retry=True)
 
-            # Soft Skills Generation
-            soft_skill_prompt = f"""
+        # Soft Skills Generation
+        soft_skill_prompt = f"""
 Based on the job descriptions, list 4 soft skills that are most valuable for a {level} {role}.
 
 Format:
 - Markdown bullet list
 - Each soft skill should include a 1-sentence explanation
 """
-            soft_skills = generate_with_gemini(soft_skill_prompt)
-
-            st.subheader("💼 Top Skills for This Role")
-            st.markdown("#### 🛠️ Technical Skills")
-            st.info(skills)
-
-            st.markdown("#### 🤝 Soft Skills")
-            st.info(soft_skills)
+        request_generation(key, "soft_skills", soft_skill_prompt, retry=True)
+        requested.add(key)
     else:
         st.error("No job descriptions found for this role.")
 
+if key in requested:
+    st.subheader("☁️ Word Cloud for This Role")
+    cloud_png = wordcloud_path(role)  # precomputed by the CSV export
+    if cloud_png:
+        st.image(cloud_png, use_column_width=True)
+    else:
+        # Cached per dataset version: this block runs on every rerun, including the polling ones
+        st.image(wordcloud_png(role, version), use_column_width=True)
+
+    st.markdown("---")
+
+    st.subheader("✨ Your AI-Tailored 'About Me'")
+    show_result(key, "about_me", st.success)
+
+    st.subheader("💼 Top Skills for This Role")
+    st.markdown("#### 🛠️ Technical Skills")
+    show_result(key, "skills", st.info)
+
+    st.markdown("#### 🤝 Soft Skills")
+    show_result(key, "soft_skills", st.info)
+
 # Cover Letter Generator
 st.markdown("---")
 if st.checkbox("Generate a Full Cover Letter"):
+    combined_descriptions = job_context(role, version, matches)
     cover_prompt = f"""
 Write a professional cover letter for a {level} {role} position.
 
@@ -224,9 +310,39 @@ Requirements:
 - Avoid: Generic phrases like "I'm perfect for this role"
 
 Job Context:
-{combined_descriptions if 'combined_descriptions' in locals() else 'No job descriptions loaded'}
+{combined_descriptions or 'No job descriptions loaded'}
 """
-    cover_letter = generate_with_gemini(cover_prompt)
+    request_generation(key, "cover_letter", cover_prompt)
     st.subheader("📝 Cover Letter")
-    st.write(cover_letter)
+    show_result(key, "cover_letter", st.write)
+    if generation_failed(stored_results(key).get("cover_letter", "")) and st.button("🔁 Retry Cover Letter"):
+        request_generation(key, "cover_letter", cover_prompt, retry=True)
+        st.rerun()
 
+# Market Trends
+st.markdown("---")
+if st.checkbox("📈 Show Market Trends"):
+    counts, keyword_counts = load_trends(dataset_version("role_weekly_counts.csv"))
+    if counts is None or counts.empty:
+        st.info("No trend data yet. Run the CSV export after scraping to build it.")
+    else:
+        st.subheader(f"📈 Weekly Postings for {role}")
+        role_counts = counts[counts["role"] == role]
+        st.line_chart(role_counts.pivot_table(index="week", columns="source", values="jobs", aggfunc="sum"))
+
+        st.markdown("#### 🏢 Work Type Mix")
+        st.bar_chart(role_counts.pivot_table(index="week", columns="work_type", values="jobs", aggfunc="sum"))
+
+        st.markdown("#### 🧩 Skill Demand Over Time")
+        role_keywords = keyword_counts[keyword_counts["role"] == role]
+        top_terms = role_keywords.groupby("keyword")["jobs"].sum().nlargest(8).index
+        st.line_chart(role_keywords[role_keywords["keyword"].isin(top_terms)]
+                      .pivot_table(index="week", columns="keyword", values="jobs", aggfunc="sum"))
+
+        st.markdown("#### 🌐 Postings by Role")
+        st.bar_chart(counts.pivot_table(index="week", columns="role", values="jobs", aggfunc="sum"))
+
+# Poll until this selection's background generations finish
+if is_pending(key):
+    time.sleep(1)
+    st.rerun()
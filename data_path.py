@@ -0,0 +1,13 @@
+"""Make the shared pipeline modules in data/ importable from the repository root.
+
+The scrapers in data/ import each other as top-level modules (they run from
+that directory and in its Docker image), so root scripts import this module
+once before importing any of them.
+"""
+import os
+import sys
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+if DATA_DIR not in sys.path:
+    sys.path.append(DATA_DIR)
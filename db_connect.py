@@ -1,7 +1,8 @@
-import mysql.connector
 import logging
 from dotenv import load_dotenv
-import os
+
+import data_path  # noqa: F401  (puts data/ on sys.path)
+from storage import JOB_FIELDS, get_db_connection, save_job
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -12,52 +13,9 @@ load_dotenv('../config/.env')
 
 def get_connection():
     """Create and return MySQL database connection"""
-    try:
-        return mysql.connector.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            user=os.getenv("DB_USER", "root"),
-            password=os.getenv("DB_PASSWORD", "Timmy@2013"),
-            database=os.getenv("DB_NAME", "job_scraper")
-        )
-    except mysql.connector.Error as err:
-        logger.error(f"Database connection failed: {err}")
-        raise
+    return get_db_connection()
 
 def insert_job(data):
-    """Insert job data into MySQL database"""
-    conn = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        sql = """
-        INSERT INTO jobs (
-            title, 
-            company, 
-            location, 
-            link, 
-            source, 
-            date_posted,
-            work_type,
-            employment_type,
-            description
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE 
-            title=VALUES(title),
-            company=VALUES(company),
-            location=VALUES(location),
-            work_type=VALUES(work_type),
-            employment_type=VALUES(employment_type),
-            description=VALUES(description)
-        """
-        cursor.execute(sql, data)
-        conn.commit()
-        logger.info(f"Inserted job: {data[0]} at {data[1]}")
-        
-    except mysql.connector.Error as err:
-        logger.error(f"Failed to insert job: {err}")
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
\ No newline at end of file
+    """Insert a job given as a (title, company, location, link, source, date_posted,
+    work_type, employment_type, description) tuple through the shared writer."""
+    return save_job(dict(zip(JOB_FIELDS, data)))
@@ -0,0 +1,34 @@
+-- One-time upgrade for databases created before near-duplicate detection and
+-- the weekly aggregates. New installs get all of this from the README schema.
+-- Run once: mysql -u your_username -p job_scraper < upgrade_schema.sql
+
+-- link must be a unique key: ON DUPLICATE KEY UPDATE needs it to upsert re-scrapes,
+-- and dedup.index_job looks postings up by link on every write.
+-- If this fails with "Duplicate entry", older re-scrapes left copies behind; keep one per link first:
+--   CREATE TABLE jobs_unique LIKE jobs;
+--   ALTER TABLE jobs_unique MODIFY link VARCHAR(512), ADD UNIQUE KEY (link);
+--   INSERT IGNORE INTO jobs_unique SELECT * FROM jobs;
+--   RENAME TABLE jobs TO jobs_with_duplicates, jobs_unique TO jobs;
+ALTER TABLE jobs
+    MODIFY link VARCHAR(512),
+    ADD UNIQUE KEY (link),
+    ADD COLUMN minhash BLOB,
+    ADD COLUMN dup_of VARCHAR(512);
+
+CREATE TABLE IF NOT EXISTS job_lsh (
+    band CHAR(27),
+    link VARCHAR(512),
+    PRIMARY KEY (band, link)
+);
+
+CREATE TABLE IF NOT EXISTS analytics_seen (link VARCHAR(512) PRIMARY KEY);
+
+CREATE TABLE IF NOT EXISTS role_weekly_counts (
+    week DATE, role VARCHAR(64), source VARCHAR(32), work_type VARCHAR(32), jobs INT,
+    PRIMARY KEY (week, role, source, work_type)
+);
+
+CREATE TABLE IF NOT EXISTS role_keyword_weekly (
+    week DATE, role VARCHAR(64), keyword VARCHAR(64), jobs INT,
+    PRIMARY KEY (week, role, keyword)
+);